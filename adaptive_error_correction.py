@@ -1,12 +1,13 @@
 #!/usr/bin/env python
 # Adaptive Error Correction using Reinforcement Learning
 import numpy as np
-import tensorflow as tf
-from qiskit import QuantumCircuit, Aer, execute
-from qiskit.providers.aer.noise import NoiseModel, depolarizing_error
+
+# qiskit and TensorFlow are imported inside the functions that use them so
+# that running the script (or importing it for a single helper) stays fast.
 
 # Create Bell state circuit
 def create_bell_circuit():
+    from qiskit import QuantumCircuit
     qc = QuantumCircuit(2, 2)
     qc.h(0)
     qc.cx(0, 1)
@@ -15,6 +16,7 @@ def create_bell_circuit():
 
 # Define Reinforcement Learning model for error correction
 def create_policy_model():
+    import tensorflow as tf
     model = tf.keras.Sequential([
         tf.keras.layers.Dense(64, activation='relu', input_shape=(2,)),
         tf.keras.layers.Dense(64, activation='relu'),
@@ -23,5 +25,14 @@ def create_policy_model():
     model.compile(optimizer='adam', loss='mse')
     return model
 
+# Train the policy with the compiled loop rather than repeated model.fit calls
+def train_policy_model(model, states, targets, weights=None, epochs=1, **config):
+    from src.error_correction.trainer import PolicyTrainer, TrainerConfig
+    trainer = PolicyTrainer(model, config=TrainerConfig(**config))
+    try:
+        return trainer.fit(states, targets, weights, epochs=epochs)
+    finally:
+        trainer.close()
+
 if __name__ == "__main__":
     print("QuantumBreakthrough Adaptive Error Correction Initialized.")
@@ -1,8 +1,13 @@
 #!/usr/bin/env python
 # Hybrid Quantum-Classical Control System
+#
+# decide_allocation is the stateless per-task rule; for streams of tasks use
+# src.hybrid_control.HybridScheduler, which applies the same thresholds with
+# queueing, batching and measured-latency cost estimates.
 
-def decide_allocation(task_complexity, system_noise, available_quantum_volume):
-    if available_quantum_volume > task_complexity and system_noise < 0.1:
+def decide_allocation(task_complexity, system_noise, available_quantum_volume,
+                      noise_threshold=0.1):
+    if available_quantum_volume > task_complexity and system_noise < noise_threshold:
         return "quantum"
     return "classical"
 
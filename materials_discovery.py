@@ -2,9 +2,10 @@
 # AI-Driven Materials Discovery
 
 import numpy as np
-import tensorflow as tf
 
+# TensorFlow is imported on first use so the CLI banner does not pay for it.
 def build_generator():
+    import tensorflow as tf
     model = tf.keras.Sequential([
         tf.keras.layers.Dense(128, activation='relu', input_dim=20),
         tf.keras.layers.Dense(256, activation='relu'),
@@ -12,5 +13,13 @@ def build_generator():
     ])
     return model
 
+# Screen generated candidates in streaming batches, keeping the best top_k;
+# with output_dir, every unique candidate scoring at least min_score is saved
+def screen_candidates(score_fn, num_candidates, top_k=100, output_dir=None, min_score=None, generator=None):
+    from src.materials_discovery import ScreeningPipeline, ScreeningConfig
+    config = ScreeningConfig(top_k=top_k, output_dir=output_dir, min_score=min_score)
+    pipeline = ScreeningPipeline(generator or build_generator(), score_fn, config)
+    return pipeline.run(num_candidates)
+
 if __name__ == "__main__":
     print("QuantumBreakthrough Materials Discovery Module Running.")
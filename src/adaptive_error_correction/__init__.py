@@ -0,0 +1,38 @@
+"""Adaptive quantum error correction.
+
+Public names are resolved lazily so that ``import src.adaptive_error_correction``
+does not pull in qiskit, Aer or the transpiler until they are needed.
+"""
+import importlib
+from typing import Any, List
+
+_LAZY_ATTRIBUTES = {
+    'QuantumEnvironment': 'environment',
+    'EnvironmentConfig': 'environment',
+    'ExecutionResult': 'environment',
+    'QuantumEnvironmentError': 'environment',
+    'CircuitExecutionError': 'environment',
+    'InvalidActionError': 'environment',
+    'EnvironmentSnapshot': 'environment',
+    'StatevectorSimulator': 'statevector',
+    'MPSSimulator': 'mps',
+    'choose_simulation_method': 'backends',
+    'SimulationMethodError': 'backends',
+    'CircuitOptimizer': 'circuit_optimizer',
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,84 @@
+from typing import Iterable, Optional, Sequence
+from src.adaptive_error_correction.statevector import StatevectorSimulator
+from src.adaptive_error_correction.mps import MPSSimulator
+
+STATEVECTOR = 'statevector'
+MATRIX_PRODUCT_STATE = 'matrix_product_state'
+STABILIZER = 'stabilizer'
+AUTOMATIC = 'automatic'
+
+SIMULATION_METHODS = (STATEVECTOR, MATRIX_PRODUCT_STATE, STABILIZER)
+CLIFFORD_GATES = frozenset({'i', 'id', 'x', 'y', 'z', 'h', 's', 'sdg', 'cx', 'cz', 'swap', 'measure', 'barrier'})
+
+# Engines the environment can run itself; method names follow qiskit Aer so
+# the same choice can be passed straight through as backend options.
+ENGINES = {
+    STATEVECTOR: StatevectorSimulator,
+    MATRIX_PRODUCT_STATE: MPSSimulator,
+}
+
+COMPLEX_BYTES = 16
+# Applying a gate produces a new state array before the old one is freed.
+STATEVECTOR_COPIES = 2
+
+class SimulationMethodError(ValueError):
+    """Raised when no simulation method fits the request."""
+    pass
+
+def statevector_memory_bytes(num_qubits: int) -> int:
+    return STATEVECTOR_COPIES * COMPLEX_BYTES * 2 ** num_qubits
+
+def mps_memory_bytes(num_qubits: int, max_bond_dimension: int) -> int:
+    """Upper bound for an MPS whose bonds are capped at ``max_bond_dimension``.
+
+    Bonds can also never exceed the dimension of the smaller side of the
+    cut, so short chains stay small even with a generous cap.
+    """
+    total = 0
+    for site in range(num_qubits):
+        left = min(max_bond_dimension, 2 ** min(site, num_qubits - site))
+        right = min(max_bond_dimension, 2 ** min(site + 1, num_qubits - site - 1))
+        total += left * 2 * right
+    return STATEVECTOR_COPIES * COMPLEX_BYTES * total
+
+def choose_simulation_method(
+    num_qubits: int,
+    gates: Iterable[str] = (),
+    memory_budget_mb: float = 1024,
+    max_bond_dimension: int = 64,
+    methods: Sequence[str] = SIMULATION_METHODS
+) -> str:
+    """Pick the cheapest exact-enough method for a circuit.
+
+    Statevector is exact and fastest while the dense state fits in the
+    memory budget. Beyond that, Clifford-only circuits go to the
+    stabilizer method, which is exact at any width, and everything else
+    to MPS, which is exact until a bond hits ``max_bond_dimension`` and
+    reports its truncation error after that. ``methods`` restricts the
+    choice to the engines a caller actually has.
+    """
+    budget = memory_budget_mb * 1024 * 1024
+    if STATEVECTOR in methods and statevector_memory_bytes(num_qubits) <= budget:
+        return STATEVECTOR
+    if STABILIZER in methods and set(gates) <= CLIFFORD_GATES:
+        return STABILIZER
+    if MATRIX_PRODUCT_STATE in methods and mps_memory_bytes(num_qubits, max_bond_dimension) <= budget:
+        return MATRIX_PRODUCT_STATE
+    raise SimulationMethodError(
+        f"No simulation method among {tuple(methods)} fits {num_qubits} qubits "
+        f"in {memory_budget_mb} MB (max_bond_dimension={max_bond_dimension})")
+
+def resolve_simulation_method(
+    method: Optional[str],
+    num_qubits: int,
+    gates: Iterable[str] = (),
+    memory_budget_mb: float = 1024,
+    max_bond_dimension: int = 64,
+    methods: Sequence[str] = SIMULATION_METHODS
+) -> str:
+    """Validate an explicit method, or choose one when ``method`` is automatic."""
+    if method in (None, AUTOMATIC):
+        return choose_simulation_method(num_qubits, gates, memory_budget_mb, max_bond_dimension, methods)
+    if method not in methods:
+        raise SimulationMethodError(f"Unsupported simulation method: {method}")
+    return method
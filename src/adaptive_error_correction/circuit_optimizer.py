@@ -1,9 +1,22 @@
-from typing import Optional, Any
-from qiskit import QuantumCircuit
-from qiskit.transpiler import PassManager, PassManagerConfig
-from qiskit.transpiler.passes import Unroller, Optimize1qGates, CXCancellation, CommutativeCancellation, Optimize1qGatesDecomposition, Layout, BarrierBeforeMeasure
-from qiskit.transpiler.preset_passmanagers import level_2_pass_manager
+from __future__ import annotations
+
+import logging
+import time
+from typing import Optional, Any, TYPE_CHECKING
 from functools import lru_cache
+from src.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from qiskit import QuantumCircuit
+    from qiskit.transpiler import PassManager
+
+# The transpiler stack is the slowest part of qiskit to import; defer it until
+# the first optimizer is constructed.
+transpiler = lazy_import('qiskit.transpiler')
+transpiler_passes = lazy_import('qiskit.transpiler.passes')
+preset_passmanagers = lazy_import('qiskit.transpiler.preset_passmanagers')
+
+logger = logging.getLogger(__name__)
 
 class CircuitOptimizer:
     """Optimizes quantum circuits for better performance and error resistance."""
@@ -15,12 +28,12 @@ class CircuitOptimizer:
         
     def _create_optimized_pass_manager(self) -> PassManager:
         """Create an optimized pass manager with custom configurations."""
-        config = PassManagerConfig(
+        config = transpiler.PassManagerConfig(
             basis_gates=['u1', 'u2', 'u3', 'cx'],
             optimization_level=self.optimization_level,
             backend_properties=None
         )
-        return level_2_pass_manager(config)
+        return preset_passmanagers.level_2_pass_manager(config)
         
     @lru_cache(maxsize=128)
     def optimize(self, circuit: QuantumCircuit) -> QuantumCircuit:
@@ -47,7 +60,7 @@ class CircuitOptimizer:
             base_circuit = self.optimize(circuit)
             if noise_model:
                 # Apply noise-aware optimizations
-                layout_pass = Layout()
+                layout_pass = transpiler_passes.Layout()
                 base_circuit = layout_pass.run(base_circuit)
             
             self.optimization_history.append({
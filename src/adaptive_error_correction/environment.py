@@ -1,17 +1,32 @@
+from __future__ import annotations
+
+import copy
 import logging
-from typing import Tuple, Dict, Any, Optional, List, NoReturn
+from typing import Tuple, Dict, Any, Optional, List, NoReturn, Iterator, TYPE_CHECKING
 import numpy as np
-from qiskit import QuantumCircuit, Aer, execute
-from qiskit.providers.aer.noise import NoiseModel
-from qiskit.quantum_info import state_fidelity
 from dataclasses import dataclass
-from functools import lru_cache
-from src.adaptive_error_correction.circuit_optimizer import CircuitOptimizer
-from src.monitoring.metrics import MetricsCollector
+from src.utils.lazy_import import lazy_import
+from src.adaptive_error_correction.statevector import Operation
+from src.adaptive_error_correction.backends import (
+    ENGINES, MATRIX_PRODUCT_STATE, AUTOMATIC, resolve_simulation_method
+)
+
+if TYPE_CHECKING:
+    from qiskit.providers.aer.noise import NoiseModel
+
+# Aer is only needed to export the noise model, so it is imported on first use.
+aer_noise = lazy_import('qiskit.providers.aer.noise')
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PAULI_ERRORS = ('x', 'y', 'z')
+# A one-qubit depolarizing channel picks uniformly from all four Paulis,
+# identity included, as Aer's depolarizing_error does.
+DEPOLARIZING_PAULIS = ('i',) + PAULI_ERRORS
+# Gates that carry the depolarizing error, as in the Aer noise model.
+NOISY_GATES = ['x', 'z', 'h']
+
 class QuantumEnvironmentError(Exception):
     """Base exception for quantum environment errors."""
     pass
@@ -20,7 +35,7 @@ class CircuitExecutionError(QuantumEnvironmentError):
     """Raised when circuit execution fails."""
     pass
 
-class InvalidActionError(QuantumEnvironmentError):
+class InvalidActionError(QuantumEnvironmentError, ValueError):
     """Raised when an invalid action is attempted."""
     pass
 
@@ -30,6 +45,10 @@ class EnvironmentConfig:
     noise_level: float = 0.01
     max_steps: int = 100
     reward_threshold: float = 0.95
+    seed: Optional[int] = None
+    simulation_method: str = AUTOMATIC
+    max_bond_dimension: int = 64
+    memory_budget_mb: int = 1024
 
 @dataclass
 class ExecutionResult:
@@ -38,8 +57,35 @@ class ExecutionResult:
     done: bool
     info: Dict[str, Any]
 
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.state, self.reward, self.done, self.info))
+
+@dataclass(frozen=True)
+class EnvironmentSnapshot:
+    """Point-in-time capture of an environment for branching rollouts.
+
+    The state (a dense array, or a tuple of MPS site tensors) is read-only
+    and shared with the environment it came from, so taking a snapshot
+    costs O(1); the step counter and RNG state make a restored environment
+    replay the same noise realisation. MPS snapshots also keep the
+    orthogonality center so restoring needs no re-canonicalization, and
+    the observation is kept so it need not be recomputed either.
+    """
+    state: Any
+    steps: int
+    rng_state: Dict[str, Any]
+    truncation_error: float = 0.0
+    center: int = 0
+    observation: Optional[np.ndarray] = None
+
 class QuantumEnvironment:
     """Environment for quantum error correction using RL.
+
+    Noise follows the Aer model from ``noise_model``: a one-qubit
+    depolarizing error of strength ``noise_level`` after every x, z and h
+    gate. The native engines sample one trajectory of that channel per gate
+    instead of carrying a density matrix. Statevector observations are
+    ``np.real`` of the statevector, as they were when this ran on Aer.
     
     Attributes:
         valid_gates (List[str]): List of supported quantum gates
@@ -47,6 +93,8 @@ class QuantumEnvironment:
     """
     
     valid_gates = ['x', 'z', 'h']
+    # Actions are bit-flip and phase-flip corrections on each qubit.
+    correction_gates = ('x', 'z')
     backend_options = {
         'method': 'statevector',
         'max_parallel_threads': 8,
@@ -60,34 +108,98 @@ class QuantumEnvironment:
         except Exception as e:
             raise QuantumEnvironmentError(f"Environment initialization failed: {e}")
 
+    @property
+    def num_qubits(self) -> int:
+        return self.config.num_qubits
+
+    @property
+    def noise_level(self) -> float:
+        return self.config.noise_level
+
+    @property
+    def action_size(self) -> int:
+        return len(self.correction_gates) * self.num_qubits
+
+    @property
+    def state_size(self) -> int:
+        if self.simulation_method == MATRIX_PRODUCT_STATE:
+            return 3 * self.num_qubits
+        return 2 ** self.num_qubits
+
     def _initialize_environment(self) -> None:
         """Initialize quantum environment with error handling."""
         try:
-            self.noise_model = self._create_noise_model()
-            self.backend = self._setup_backend()
             self._validate_configuration()
+            self.rng = np.random.default_rng(self.config.seed)
+            self._select_engine()
+            self.target = self.engine.bell_state(self.num_qubits, **self.engine_options)
+            self.simulator = self.target.copy()
+            self.steps = 0
+            self._observation: Optional[np.ndarray] = None
+            self._noise_model: Optional[NoiseModel] = None
         except Exception as e:
             raise QuantumEnvironmentError(f"Initialization failed: {e}")
 
+    @property
+    def noise_model(self) -> NoiseModel:
+        """Aer noise model equivalent to the sampled noise, built on first use."""
+        if self._noise_model is None:
+            self._noise_model = self._create_noise_model()
+        return self._noise_model
+
     def _create_noise_model(self) -> NoiseModel:
         """Create a noise model for the quantum circuit."""
         try:
-            noise_model = NoiseModel()
-            error = noise_model.add_all_qubit_quantum_error(
-                noise_model.depolarizing_error(self.noise_level, 1),
-                ['x', 'z', 'h']
+            noise_model = aer_noise.NoiseModel()
+            noise_model.add_all_qubit_quantum_error(
+                aer_noise.depolarizing_error(self.noise_level, 1),
+                NOISY_GATES
             )
             return noise_model
         except Exception as e:
             logger.error(f"Failed to create noise model: {str(e)}")
             raise
 
+    def _select_engine(self) -> None:
+        """Choose statevector or MPS from the qubit count and memory budget.
+
+        Observations are the real amplitudes for statevector and the
+        per-qubit <X>, <Y>, <Z> expectations for MPS, where a dense vector
+        would not fit.
+        """
+        gates = set(self.correction_gates) | set(PAULI_ERRORS) | {'h', 'cx'}
+        self.simulation_method = resolve_simulation_method(
+            self.config.simulation_method, self.num_qubits, gates,
+            memory_budget_mb=self.config.memory_budget_mb,
+            max_bond_dimension=self.config.max_bond_dimension,
+            methods=tuple(ENGINES)
+        )
+        self.engine = ENGINES[self.simulation_method]
+        self.engine_options: Dict[str, Any] = {}
+        self.backend_options = dict(type(self).backend_options, method=self.simulation_method,
+                                    max_memory_mb=self.config.memory_budget_mb)
+        if self.simulation_method == MATRIX_PRODUCT_STATE:
+            self.engine_options['max_bond_dimension'] = self.config.max_bond_dimension
+            self.backend_options['matrix_product_state_max_bond_dimension'] = self.config.max_bond_dimension
+
+    def _validate_configuration(self) -> None:
+        """Check the configuration before any state is allocated."""
+        if self.config.num_qubits < 2:
+            raise ValueError("num_qubits must be at least 2 to hold the Bell state")
+        if not 0.0 <= self.config.noise_level <= 1.0:
+            raise ValueError("noise_level must be between 0 and 1")
+        if self.config.max_bond_dimension < 1:
+            raise ValueError("max_bond_dimension must be positive")
+
     def reset(self) -> np.ndarray:
         """Reset the environment to initial state."""
         try:
-            self.circuit = QuantumCircuit(self.num_qubits)
-            self.circuit.h(0)
-            self.circuit.cx(0, 1)
+            prep_error = self._depolarizing_error()
+            if prep_error is None:
+                self.simulator = self.target.copy()
+            else:
+                self.simulator = self.engine(self.num_qubits, **self.engine_options)
+                self.simulator.apply_sequence([('h', 0), (prep_error, 0), ('cx', (0, 1))])
             self.steps = 0
             return self._get_state()
         except Exception as e:
@@ -96,21 +208,61 @@ class QuantumEnvironment:
 
     def _validate_action(self, action: int) -> None:
         """Validate the action before applying it."""
+        if isinstance(action, bool) or not isinstance(action, (int, np.integer)):
+            raise InvalidActionError(f"Invalid action {action!r}. Must be an integer")
         if not 0 <= action < self.action_size:
             raise InvalidActionError(f"Invalid action {action}. Must be between 0 and {self.action_size-1}")
 
-    @lru_cache(maxsize=128)
+    def _decode_action(self, action: int) -> Tuple[str, int]:
+        """Map an action index to a (gate, qubit) pair."""
+        qubit, gate_index = divmod(action, len(self.correction_gates))
+        return self.correction_gates[gate_index], qubit
+
     def _get_state(self) -> np.ndarray:
-        """Get the current state of the quantum system with caching."""
-        circuit_key = hash(self.circuit.qasm())
-        if circuit_key in self._state_cache:
-            return self._state_cache[circuit_key]
-            
-        job = execute(self.circuit, self.backend, noise_model=self.noise_model)
-        statevector = job.result().get_statevector()
-        state = np.real(statevector)
-        self._state_cache[circuit_key] = state
-        return state
+        """Get the current state of the quantum system."""
+        self._observation = self.simulator.observation()
+        return self._observation
+
+    def _depolarizing_error(self) -> Optional[str]:
+        """Sample one trajectory of the depolarizing channel on a noisy gate.
+
+        With probability ``noise_level`` a Pauli is drawn uniformly from
+        I, X, Y and Z, so a non-identity error occurs with probability
+        ``3 * noise_level / 4``. Returns the error gate, or None.
+        """
+        if self.rng.random() < self.noise_level:
+            pauli = DEPOLARIZING_PAULIS[self.rng.integers(len(DEPOLARIZING_PAULIS))]
+            if pauli != 'i':
+                return pauli
+        return None
+
+    def _action_operations(self, action: int) -> List[Operation]:
+        """The correction gate, followed by its depolarizing error if one occurs."""
+        gate, qubit = self._decode_action(action)
+        operations = [(gate, qubit)]
+        self._last_error = self._depolarizing_error()
+        if self._last_error is not None:
+            operations.append((self._last_error, qubit))
+        return operations
+
+    def _apply_action_safely(self, action: int) -> np.ndarray:
+        self.simulator.apply_sequence(self._action_operations(action))
+        self.steps += 1
+        return self._get_state()
+
+    def _calculate_reward(self) -> float:
+        """Reward is the fidelity with the target Bell state."""
+        return self._calculate_fidelity()
+
+    def _gather_step_info(self, action: int) -> Dict[str, Any]:
+        gate, qubit = self._decode_action(action)
+        return {
+            'steps': self.steps,
+            'gate': gate,
+            'qubit': qubit,
+            'error': self._last_error,
+            'truncation_error': self.simulator.truncation_error,
+        }
 
     def step(self, action: int) -> ExecutionResult:
         """Execute one step with enhanced error handling."""
@@ -118,8 +270,8 @@ class QuantumEnvironment:
             self._validate_action(action)
             next_state = self._apply_action_safely(action)
             reward = self._calculate_reward()
-            done = self._check_termination()
-            info = self._gather_step_info()
+            done = self._check_done()
+            info = self._gather_step_info(action)
             
             return ExecutionResult(next_state, reward, done, info)
         except InvalidActionError as e:
@@ -127,11 +279,79 @@ class QuantumEnvironment:
         except Exception as e:
             raise CircuitExecutionError(f"Step execution failed: {e}")
 
+    def step_sequence(self, actions: List[int]) -> ExecutionResult:
+        """Apply a run of actions as one fused update and report the final step.
+
+        Noise is drawn exactly as ``step`` would draw it, so the final state
+        matches stepping through ``actions`` one at a time, but the whole
+        run costs a handful of full-state passes instead of one per gate.
+        """
+        for action in actions:
+            self._validate_action(action)
+        try:
+            operations: List[Operation] = []
+            errors = []
+            for action in actions:
+                operations.extend(self._action_operations(action))
+                errors.append(self._last_error)
+            self.simulator.apply_sequence(operations)
+            self.steps += len(actions)
+            info = {'steps': self.steps, 'actions': len(actions), 'errors': errors,
+                    'truncation_error': self.simulator.truncation_error}
+            return ExecutionResult(self._get_state(), self._calculate_reward(), self._check_done(), info)
+        except Exception as e:
+            raise CircuitExecutionError(f"Step execution failed: {e}")
+
+    def snapshot(self) -> EnvironmentSnapshot:
+        """Capture the current state, step counter and RNG state."""
+        return EnvironmentSnapshot(
+            state=self.simulator.state,
+            steps=self.steps,
+            rng_state=self.rng.bit_generator.state,
+            truncation_error=self.simulator.truncation_error,
+            center=getattr(self.simulator, 'center', 0),
+            observation=self._observation if self._observation is not None else self._get_state()
+        )
+
+    def restore(self, snapshot: EnvironmentSnapshot) -> np.ndarray:
+        """Return the environment to a previously captured snapshot."""
+        self.simulator = self.simulator.copy()
+        if self.simulation_method == MATRIX_PRODUCT_STATE:
+            self.simulator.load_canonical(snapshot.state, snapshot.center)
+        else:
+            self.simulator.state = snapshot.state
+        self.simulator.truncation_error = snapshot.truncation_error
+        self.steps = snapshot.steps
+        self.rng.bit_generator.state = snapshot.rng_state
+        if snapshot.observation is None:
+            return self._get_state()
+        self._observation = snapshot.observation
+        return snapshot.observation.copy()
+
+    def fork(self, n: int, independent_noise: bool = False) -> List['QuantumEnvironment']:
+        """Create ``n`` environments branching from the current state.
+
+        Branches share the current state array until they step. By default
+        each branch replays the same noise draws as this environment, which
+        makes the outcomes of alternative actions directly comparable; pass
+        ``independent_noise=True`` to give each branch its own RNG stream.
+        """
+        branches = []
+        for i in range(n):
+            branch = copy.copy(self)
+            branch.simulator = self.simulator.copy()
+            if independent_noise:
+                branch.rng = np.random.Generator(self.rng.bit_generator.jumped(i + 1))
+            else:
+                branch.rng = np.random.Generator(type(self.rng.bit_generator)())
+                branch.rng.bit_generator.state = self.rng.bit_generator.state
+            branches.append(branch)
+        return branches
+
     def _calculate_fidelity(self) -> float:
         """Calculate the fidelity of the current state."""
         try:
-            # Implementation details
-            pass
+            return self.simulator.fidelity(self.target)
         except Exception as e:
             logger.error(f"Failed to calculate fidelity: {str(e)}")
             raise
@@ -0,0 +1,224 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from src.adaptive_error_correction.statevector import GATES, CX, Operation, fuse
+
+MAX_DENSE_QUBITS = 24
+
+SWAP = np.array([[1, 0, 0, 0],
+                 [0, 0, 1, 0],
+                 [0, 1, 0, 0],
+                 [0, 0, 0, 1]], dtype=np.complex128)
+SWAP.flags.writeable = False
+
+PAULI_OBSERVABLES = (GATES['x'], GATES['y'], GATES['z'])
+
+MPSState = Tuple[np.ndarray, ...]
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array = np.ascontiguousarray(array)
+    array.flags.writeable = False
+    return array
+
+class MPSSimulator:
+    """Matrix-product-state simulator for weakly entangled circuits.
+
+    Site ``i`` holds qubit ``i`` as a tensor of shape (left bond, 2, right
+    bond). The state is kept in mixed canonical form around ``center`` so
+    that two-qubit gates can be truncated optimally with one SVD: bonds
+    are capped at ``max_bond_dimension`` and singular values below
+    ``cutoff`` are dropped, with the discarded weight accumulated in
+    ``truncation_error``. Memory grows linearly in the number of qubits for
+    a bounded bond dimension. Like the dense simulator, every tensor is
+    read-only and gates replace tensors, so copies share storage.
+    """
+
+    def __init__(
+        self,
+        num_qubits: int,
+        state: Optional[MPSState] = None,
+        max_bond_dimension: int = 64,
+        cutoff: float = 1e-12
+    ):
+        if max_bond_dimension < 1:
+            raise ValueError("max_bond_dimension must be positive")
+        self.num_qubits = num_qubits
+        self.max_bond_dimension = max_bond_dimension
+        self.cutoff = cutoff
+        self.truncation_error = 0.0
+        self.passes = 0
+        self.center = 0
+        if state is None:
+            zero = np.zeros((1, 2, 1), dtype=np.complex128)
+            zero[0, 0, 0] = 1.0
+            state = (_frozen(zero),) * num_qubits
+        self.state = state
+
+    @property
+    def state(self) -> MPSState:
+        return tuple(self._tensors)
+
+    @state.setter
+    def state(self, value: MPSState) -> None:
+        if len(value) != self.num_qubits:
+            raise ValueError(f"State has {len(value)} sites, expected {self.num_qubits}")
+        self._tensors: List[np.ndarray] = [t if not t.flags.writeable else _frozen(t.astype(np.complex128))
+                                           for t in value]
+        # Nothing is known about the gauge of externally supplied tensors.
+        self.center = 0
+        self._canonicalize()
+
+    def load_canonical(self, state: MPSState, center: int) -> None:
+        """Adopt tensors already in canonical form around ``center``.
+
+        Used to restore snapshots: unlike assigning ``state`` this skips the
+        QR sweep, so it costs a list copy instead of O(n * chi^3).
+        """
+        if len(state) != self.num_qubits:
+            raise ValueError(f"State has {len(state)} sites, expected {self.num_qubits}")
+        self._tensors = list(state)
+        self.center = center
+
+    @property
+    def bond_dimensions(self) -> List[int]:
+        return [t.shape[2] for t in self._tensors[:-1]]
+
+    @classmethod
+    def bell_state(cls, num_qubits: int, **kwargs) -> 'MPSSimulator':
+        """(|0..00> + |0..11>) / sqrt(2) on qubits 0 and 1, all others |0>."""
+        simulator = cls(num_qubits, **kwargs)
+        simulator.apply('h', 0)
+        if num_qubits > 1:
+            simulator.apply_matrix(CX, (0, 1))
+        return simulator
+
+    def _canonicalize(self) -> None:
+        """Bring the state into canonical form with the center on site 0."""
+        self.center = self.num_qubits - 1
+        self._move_center(0)
+
+    def _move_center(self, site: int) -> None:
+        tensors = self._tensors
+        while self.center < site:
+            i = self.center
+            left, phys, right = tensors[i].shape
+            q, r = np.linalg.qr(tensors[i].reshape(left * phys, right))
+            tensors[i] = _frozen(q.reshape(left, phys, -1))
+            tensors[i + 1] = _frozen(np.tensordot(r, tensors[i + 1], axes=(1, 0)))
+            self.center += 1
+        while self.center > site:
+            i = self.center
+            left, phys, right = tensors[i].shape
+            q, r = np.linalg.qr(tensors[i].reshape(left, phys * right).T)
+            tensors[i] = _frozen(q.T.reshape(-1, phys, right))
+            tensors[i - 1] = _frozen(np.tensordot(tensors[i - 1], r.T, axes=(2, 0)))
+            self.center -= 1
+
+    def apply(self, gate: str, qubit: int) -> None:
+        """Apply a named single-qubit gate."""
+        self.apply_matrix(GATES[gate], (qubit,))
+
+    def apply_sequence(self, operations: Sequence[Operation]) -> None:
+        """Apply a fused gate sequence.
+
+        Independent single-qubit runs are not paired into 4x4 blocks here:
+        on an MPS that would cost swaps and an SVD instead of a cheap local
+        contraction.
+        """
+        for matrix, qubits in fuse(operations, pair_runs=False):
+            self.apply_matrix(matrix, qubits)
+
+    def apply_matrix(self, matrix: np.ndarray, qubits: Sequence[int]) -> None:
+        """Apply a 2x2 or 4x4 unitary (first qubit is the most significant)."""
+        self.passes += 1
+        if len(qubits) == 1:
+            q = qubits[0]
+            self._tensors[q] = _frozen(np.einsum('ab,lbr->lar', matrix, self._tensors[q]))
+            return
+        if len(qubits) != 2:
+            raise ValueError("MPS gates act on one or two qubits")
+        a, b = qubits
+        if a == b:
+            raise ValueError("Two-qubit gate needs distinct qubits")
+        if a > b:
+            # Reorder so the first operand is the lower site.
+            matrix = matrix.reshape(2, 2, 2, 2).transpose(1, 0, 3, 2).reshape(4, 4)
+            a, b = b, a
+        # Route qubit b next to a with swaps, apply, then route it back.
+        for site in range(b - 1, a, -1):
+            self._apply_adjacent(SWAP, site)
+        self._apply_adjacent(matrix, a)
+        for site in range(a + 1, b):
+            self._apply_adjacent(SWAP, site)
+
+    def _apply_adjacent(self, matrix: np.ndarray, site: int) -> None:
+        self._move_center(site)
+        left_tensor, right_tensor = self._tensors[site], self._tensors[site + 1]
+        left, right = left_tensor.shape[0], right_tensor.shape[2]
+        theta = np.tensordot(left_tensor, right_tensor, axes=(2, 0))
+        theta = np.einsum('xyij,lijr->lxyr', matrix.reshape(2, 2, 2, 2), theta)
+        u, s, vh = np.linalg.svd(theta.reshape(left * 2, 2 * right), full_matrices=False)
+
+        total = float(np.sum(s ** 2))
+        keep = int(np.count_nonzero(s ** 2 > self.cutoff * total)) or 1
+        keep = min(keep, self.max_bond_dimension)
+        discarded = float(np.sum(s[keep:] ** 2))
+        if discarded > 0.0:
+            self.truncation_error += discarded / total
+        s = s[:keep] / np.sqrt(np.sum(s[:keep] ** 2))
+
+        self._tensors[site] = _frozen(u[:, :keep].reshape(left, 2, keep))
+        self._tensors[site + 1] = _frozen((s[:, None] * vh[:keep]).reshape(keep, 2, right))
+        self.center = site + 1
+
+    def overlap(self, other: 'MPSSimulator') -> complex:
+        """<other|self> by a left-to-right transfer-matrix sweep."""
+        environment = np.ones((1, 1), dtype=np.complex128)
+        for mine, theirs in zip(self._tensors, other._tensors):
+            environment = np.einsum('ab,aic,bid->cd', environment, theirs.conj(), mine)
+        return complex(environment[0, 0])
+
+    def fidelity(self, target: 'MPSSimulator') -> float:
+        """|<target|state>|^2 for a pure target state."""
+        return float(abs(self.overlap(target)) ** 2)
+
+    def local_expectations(self) -> np.ndarray:
+        """<X>, <Y>, <Z> for every qubit, shape (num_qubits, 3).
+
+        Computed directly on the canonical form: sites left of the center
+        are left-orthonormal and sites right of it right-orthonormal, so
+        each qubit only needs the tensors between it and the center.
+        """
+        tensors = self._tensors
+        result = np.empty((self.num_qubits, 3))
+        for q in range(self.num_qubits):
+            lo, hi = min(q, self.center), max(q, self.center)
+            env = np.eye(tensors[lo].shape[0])
+            for k, observable in enumerate(PAULI_OBSERVABLES):
+                block = env
+                for i in range(lo, hi + 1):
+                    op = observable if i == q else GATES['i']
+                    block = np.einsum('ab,aic,ij,bjd->cd', block, tensors[i].conj(), op, tensors[i])
+                result[q, k] = float(np.real(np.trace(block)))
+        return result
+
+    def observation(self) -> np.ndarray:
+        """Flattened local expectations; a dense observation would not fit."""
+        return self.local_expectations().reshape(-1)
+
+    def to_statevector(self) -> np.ndarray:
+        """Dense state vector (qubit 0 least significant); small systems only."""
+        if self.num_qubits > MAX_DENSE_QUBITS:
+            raise ValueError(f"Refusing to densify a {self.num_qubits}-qubit MPS")
+        dense = self._tensors[0]
+        for tensor in self._tensors[1:]:
+            dense = np.tensordot(dense, tensor, axes=(-1, 0))
+        dense = dense.reshape((2,) * self.num_qubits)
+        return dense.transpose(tuple(reversed(range(self.num_qubits)))).reshape(-1)
+
+    def copy(self) -> 'MPSSimulator':
+        """Cheap copy that shares the (immutable) site tensors."""
+        clone = MPSSimulator.__new__(MPSSimulator)
+        clone.__dict__.update(self.__dict__)
+        clone._tensors = list(self._tensors)
+        clone.passes = 0
+        return clone
@@ -0,0 +1,159 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+SQRT_HALF = 1 / np.sqrt(2)
+
+GATES: Dict[str, np.ndarray] = {
+    'i': np.eye(2, dtype=np.complex128),
+    'x': np.array([[0, 1], [1, 0]], dtype=np.complex128),
+    'y': np.array([[0, -1j], [1j, 0]], dtype=np.complex128),
+    'z': np.array([[1, 0], [0, -1]], dtype=np.complex128),
+    'h': np.array([[1, 1], [1, -1]], dtype=np.complex128) * SQRT_HALF,
+}
+for _matrix in GATES.values():
+    _matrix.flags.writeable = False
+
+CX = np.array([[1, 0, 0, 0],
+               [0, 1, 0, 0],
+               [0, 0, 0, 1],
+               [0, 0, 1, 0]], dtype=np.complex128)
+CX.flags.writeable = False
+
+CZ = np.diag([1, 1, 1, -1]).astype(np.complex128)
+CZ.flags.writeable = False
+
+TWO_QUBIT_GATES: Dict[str, np.ndarray] = {'cx': CX, 'cz': CZ}
+
+Operation = Tuple[str, Union[int, Tuple[int, ...]]]
+FusedOperation = Tuple[np.ndarray, Tuple[int, ...]]
+
+@lru_cache(maxsize=4096)
+def fused_unitary(gates: Tuple[str, ...]) -> np.ndarray:
+    """Product of a run of single-qubit gates, applied left to right."""
+    matrix = GATES['i']
+    for gate in gates:
+        matrix = GATES[gate] @ matrix
+    matrix = np.ascontiguousarray(matrix)
+    matrix.flags.writeable = False
+    return matrix
+
+@lru_cache(maxsize=4096)
+def fused_pair(first: Tuple[str, ...], second: Tuple[str, ...], gate: Optional[str] = None) -> np.ndarray:
+    """4x4 unitary for independent runs on two qubits, optionally followed by a two-qubit gate."""
+    matrix = np.kron(fused_unitary(first), fused_unitary(second))
+    if gate is not None:
+        matrix = TWO_QUBIT_GATES[gate] @ matrix
+    matrix.flags.writeable = False
+    return matrix
+
+def fuse(operations: Sequence[Operation], pair_runs: bool = True) -> List[FusedOperation]:
+    """Merge a gate sequence into as few 2x2/4x4 unitaries as possible.
+
+    Single-qubit gates on different qubits commute, so each qubit's run is
+    collected until a two-qubit gate touches that qubit; the pending runs
+    on both of its qubits are then folded into the two-qubit matrix. With
+    ``pair_runs`` the remaining runs are paired into 4x4 Kronecker
+    products, which halves the passes over a dense state. Matrices come
+    from caches keyed on the gate-name sequence, so repeated correction
+    patterns are only ever multiplied out once.
+    """
+    pending: Dict[int, List[str]] = {}
+    fused: List[FusedOperation] = []
+    for gate, qubits in operations:
+        if gate in GATES:
+            qubit = qubits if isinstance(qubits, int) else qubits[0]
+            pending.setdefault(qubit, []).append(gate)
+            continue
+        if gate not in TWO_QUBIT_GATES:
+            raise ValueError(f"Unsupported gate: {gate}")
+        a, b = qubits
+        first, second = tuple(pending.pop(a, ())), tuple(pending.pop(b, ()))
+        fused.append((fused_pair(first, second, gate), (a, b)))
+
+    runs = [(qubit, tuple(gates)) for qubit, gates in pending.items()]
+    paired = len(runs) - len(runs) % 2 if pair_runs else 0
+    for i in range(0, paired, 2):
+        (a, first), (b, second) = runs[i], runs[i + 1]
+        fused.append((fused_pair(first, second), (a, b)))
+    for qubit, gates in runs[paired:]:
+        fused.append((fused_unitary(gates), (qubit,)))
+    return fused
+
+class StatevectorSimulator:
+    """Dense state-vector simulator for small circuits.
+
+    Qubit 0 is the least significant bit of the basis index, matching
+    qiskit's ordering. Gate application always produces a new array and
+    every state array is read-only, so states can be shared freely between
+    snapshots and forks; a copy is only ever made by the next gate.
+    """
+
+    # Dense simulation is exact; kept for parity with MPSSimulator.
+    truncation_error = 0.0
+
+    def __init__(self, num_qubits: int, state: Optional[np.ndarray] = None):
+        self.num_qubits = num_qubits
+        self.passes = 0
+        if state is None:
+            state = np.zeros(2 ** num_qubits, dtype=np.complex128)
+            state[0] = 1.0
+        self.state = state
+
+    @property
+    def state(self) -> np.ndarray:
+        return self._state
+
+    @state.setter
+    def state(self, value: np.ndarray) -> None:
+        if value.shape != (2 ** self.num_qubits,):
+            raise ValueError(f"State has shape {value.shape}, expected ({2 ** self.num_qubits},)")
+        if value.flags.writeable:
+            value = value.astype(np.complex128, copy=True)
+            value.flags.writeable = False
+        self._state = value
+
+    @classmethod
+    def bell_state(cls, num_qubits: int) -> 'StatevectorSimulator':
+        """(|0..00> + |0..11>) / sqrt(2) on qubits 0 and 1, all others |0>."""
+        simulator = cls(num_qubits)
+        simulator.apply('h', 0)
+        if num_qubits > 1:
+            simulator.apply_matrix(CX, (0, 1))
+        return simulator
+
+    def apply(self, gate: str, qubit: int) -> None:
+        """Apply a named single-qubit gate."""
+        self.apply_matrix(GATES[gate], (qubit,))
+
+    def apply_sequence(self, operations: Sequence[Operation]) -> None:
+        """Apply a gate sequence after fusing it into a few full-state passes."""
+        for matrix, qubits in fuse(operations):
+            self.apply_matrix(matrix, qubits)
+
+    def apply_matrix(self, matrix: np.ndarray, qubits: Sequence[int]) -> None:
+        """Apply a 2^k x 2^k unitary to ``qubits`` (first qubit is the most significant)."""
+        n = self.num_qubits
+        k = len(qubits)
+        tensor = self._state.reshape((2,) * n)
+        axes = [n - 1 - q for q in qubits]
+        gate = matrix.reshape((2,) * (2 * k))
+        result = np.tensordot(gate, tensor, axes=(list(range(k, 2 * k)), axes))
+        result = np.moveaxis(result, list(range(k)), axes)
+        state = np.ascontiguousarray(result).reshape(-1)
+        state.flags.writeable = False
+        self._state = state
+        self.passes += 1
+
+    def fidelity(self, target: Union[np.ndarray, 'StatevectorSimulator']) -> float:
+        """|<target|state>|^2 for a pure target state."""
+        target = getattr(target, 'state', target)
+        return float(abs(np.vdot(target, self._state)) ** 2)
+
+    def observation(self) -> np.ndarray:
+        """Real part of the amplitudes, the environment's observation vector."""
+        return np.real(self._state)
+
+    def copy(self) -> 'StatevectorSimulator':
+        """Cheap copy that shares the (immutable) state array."""
+        return StatevectorSimulator(self.num_qubits, self._state)
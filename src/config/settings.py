@@ -1,10 +1,55 @@
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional, List, Tuple, Union
+import copy
+import logging
+import threading
 import yaml
 import os
-from pydantic import BaseModel, validator, Field
+from types import MappingProxyType
+from pydantic import BaseModel, ValidationError, validator, Field
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH_ENV = 'QUANTUM_CONFIG_PATH'
+DEFAULT_SETTINGS_PATH = Path(__file__).resolve().parents[2] / 'config' / 'config.yaml'
+
+_yaml_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_yaml_cache_lock = threading.Lock()
+
+class ConfigurationError(Exception):
+    """Raised when the configuration file is incomplete or invalid."""
+    pass
+
+def _file_signature(path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def load_yaml(path: Union[str, Path]) -> Dict[str, Any]:
+    """Parse a YAML file, reusing the previous parse while the file is unchanged.
+
+    Callers get their own deep copy, so mutating the result never leaks into
+    the cache.
+    """
+    key = os.path.abspath(path)
+    signature = _file_signature(key)
+    if signature is None:
+        raise FileNotFoundError(f"Configuration file not found: {path}")
+
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(key)
+    if cached is None or cached[0] != signature:
+        with open(key, 'r') as f:
+            data = yaml.safe_load(f) or {}
+        cached = (signature, data)
+        with _yaml_cache_lock:
+            _yaml_cache[key] = cached
+    return copy.deepcopy(cached[1])
+
 @dataclass
 class GlobalConfig:
     """Global configuration settings for the quantum breakthrough project."""
@@ -15,12 +60,8 @@ class GlobalConfig:
 
     @classmethod
     def from_yaml(cls, config_path: str) -> 'GlobalConfig':
-        if not os.path.exists(config_path):
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        
-        with open(config_path, 'r') as f:
-            config_data = yaml.safe_load(f)
-            
+        config_data = load_yaml(config_path)
+
         return cls(
             environment_settings=config_data.get('environment', {}),
             model_settings=config_data.get('model', {}),
@@ -33,51 +74,141 @@ class EnvironmentSettings(BaseModel):
     noise_level: float
     max_steps: int
     reward_threshold: float
+    simulation_method: str = 'automatic'
+    max_bond_dimension: int = Field(64, gt=0)
+    memory_budget_mb: int = Field(1024, gt=0)
+
+    class Config:
+        frozen = True
 
     @validator('num_qubits')
     def validate_num_qubits(cls, v):
-        if not 1 <= v <= 20:
-            raise ValueError("num_qubits must be between 1 and 20")
+        # Beyond ~25 qubits the environment switches to the MPS engine.
+        if not 1 <= v <= 64:
+            raise ValueError("num_qubits must be between 1 and 64")
+        return v
+
+    @validator('simulation_method')
+    def validate_simulation_method(cls, v):
+        if v not in ('automatic', 'statevector', 'matrix_product_state'):
+            raise ValueError(f"Unsupported simulation method: {v}")
         return v
 
+class TrainingSettings(BaseModel):
+    learning_rate: float = Field(0.001, gt=0.0)
+    batch_size: int = Field(64, gt=0)
+    episodes: int = Field(1000, gt=0)
+
+    class Config:
+        frozen = True
+
+class LoggingSettings(BaseModel):
+    level: str = 'INFO'
+    file: Optional[str] = 'quantum_breakthrough.log'
+
+    class Config:
+        frozen = True
+
 class QuantumSettings(BaseModel):
     num_qubits: int = Field(gt=0, lt=50)
     noise_level: float = Field(gt=0.0, lt=1.0)
     optimization_level: int = Field(ge=0, le=3)
-    
+
 class SecuritySettings(BaseModel):
     encryption_algorithm: str
     key_rotation_days: int = Field(gt=0)
-    
+
 class GlobalSettings(BaseModel):
     quantum: QuantumSettings
     security: SecuritySettings
     environment: Dict[str, Any]
-    
+
     class Config:
         validate_assignment = True
         extra = "forbid"
 
+SECTION_MODELS = {
+    'environment': EnvironmentSettings,
+    'training': TrainingSettings,
+    'logging': LoggingSettings,
+}
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of parsed YAML: mappings become proxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Immutable, fully validated view of the configuration at one point in time."""
+    raw: Mapping[str, Any]
+    environment: EnvironmentSettings
+    training: TrainingSettings
+    logging: LoggingSettings
+    source_signature: Optional[Tuple[int, int]]
+
 class Settings:
-    """Global settings management."""
-    
-    def __init__(self):
-        self.config_path = Path(__file__).parent / "config.yaml"
-        self.settings = self.load_config()
-        self._load_environment_variables()
-        self._validate_settings()
+    """Global settings management.
+
+    The configuration is parsed and validated once into a frozen
+    ``SettingsSnapshot``. ``reload()`` builds a new snapshot and swaps it in
+    with a single reference assignment, so readers never observe a partially
+    updated configuration. Use ``get_settings()`` for the process-wide instance.
+
+    The config file is ``config_path`` if given, else ``$QUANTUM_CONFIG_PATH``,
+    else the repository's ``config/config.yaml``; a missing file falls back
+    to the built-in defaults. Environment variables named
+    ``QUANTUM_<SECTION>_<FIELD>`` override declared fields only.
+    """
+
+    env_prefix = "QUANTUM_"
+
+    def __init__(self, config_path: Optional[Union[str, Path]] = None):
+        self.config_path = Path(config_path or os.environ.get(CONFIG_PATH_ENV) or DEFAULT_SETTINGS_PATH)
+        if not self.config_path.exists():
+            logger.warning(f"Configuration file {self.config_path} not found, using defaults")
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._snapshot = self._build_snapshot()
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        return self._snapshot
+
+    @property
+    def settings(self) -> Mapping[str, Any]:
+        return self._snapshot.raw
+
+    @property
+    def environment(self) -> EnvironmentSettings:
+        return self._snapshot.environment
+
+    @property
+    def environment_settings(self) -> EnvironmentSettings:
+        return self._snapshot.environment
+
+    @property
+    def training(self) -> TrainingSettings:
+        return self._snapshot.training
+
+    @property
+    def logging(self) -> LoggingSettings:
+        return self._snapshot.logging
 
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         if not self.config_path.exists():
             return self.create_default_config()
-        
-        with open(self.config_path, 'r') as f:
-            return yaml.safe_load(f)
+        return load_yaml(self.config_path)
 
-    def create_default_config(self) -> Dict[str, Any]:
+    @staticmethod
+    def create_default_config() -> Dict[str, Any]:
         """Create default configuration."""
-        default_config = {
+        return {
             'environment': {
                 'num_qubits': 2,
                 'noise_level': 0.01,
@@ -94,25 +225,69 @@ class Settings:
                 'file': 'quantum_breakthrough.log'
             }
         }
-        
-        with open(self.config_path, 'w') as f:
-            yaml.dump(default_config, f)
-        
-        return default_config
-
-    def _load_environment_variables(self):
-        """Override settings with environment variables."""
-        env_prefix = "QUANTUM_"
-        for key in os.environ:
-            if key.startswith(env_prefix):
-                setting_path = key[len(env_prefix):].lower().split("_")
-                self._update_nested_dict(self.settings, setting_path, os.environ[key])
-
-    def _update_nested_dict(self, d: dict, keys: list, value: Any):
-        """Update nested dictionary with value at path specified by keys."""
-        for key in keys[:-1]:
-            d = d.setdefault(key, {})
-        d[keys[-1]] = self._convert_value(value)
+
+    def _build_snapshot(self) -> SettingsSnapshot:
+        """Parse, apply environment overrides and validate a new snapshot."""
+        signature = _file_signature(self.config_path)
+        settings = self.load_config()
+        self._load_environment_variables(settings)
+        if 'environment' not in settings:
+            raise ConfigurationError(f"{self.config_path}: missing required 'environment' section")
+        try:
+            sections = {name: model(**settings.get(name, {})) for name, model in SECTION_MODELS.items()}
+        except ValidationError as e:
+            raise ConfigurationError(f"{self.config_path}: {e}") from e
+        return SettingsSnapshot(raw=_freeze(settings), source_signature=signature, **sections)
+
+    def reload(self) -> bool:
+        """Re-read the configuration and atomically swap in the new snapshot.
+
+        Returns False and keeps the current snapshot if the new configuration
+        fails to load or validate.
+        """
+        with self._lock:
+            try:
+                snapshot = self._build_snapshot()
+            except Exception as e:
+                logger.error(f"Settings reload failed, keeping previous configuration: {e}")
+                return False
+            self._snapshot = snapshot
+        logger.info(f"Settings reloaded from {self.config_path}")
+        return True
+
+    def check_for_changes(self) -> bool:
+        """Reload if the config file changed since the last load."""
+        if _file_signature(self.config_path) == self._snapshot.source_signature:
+            return False
+        return self.reload()
+
+    def watch(self, interval: float = 1.0) -> None:
+        """Poll the config file's mtime in a daemon thread and hot-reload on change."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+
+        def _poll() -> None:
+            while not self._stop_watching.wait(interval):
+                self.check_for_changes()
+
+        self._watcher = threading.Thread(target=_poll, name="settings-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background file watcher, if running."""
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _load_environment_variables(self, settings: Dict[str, Any]) -> None:
+        """Override declared fields with ``QUANTUM_<SECTION>_<FIELD>`` variables."""
+        for section, model in SECTION_MODELS.items():
+            for name in model.__fields__:
+                value = os.environ.get(f"{self.env_prefix}{section}_{name}".upper())
+                if value is not None:
+                    settings.setdefault(section, {})[name] = self._convert_value(value)
 
     @staticmethod
     def _convert_value(value: str) -> Any:
@@ -125,6 +300,20 @@ class Settings:
             except ValueError:
                 return value if value.lower() not in ['true', 'false'] else value.lower() == 'true'
 
-    def _validate_settings(self):
-        """Validate settings using pydantic models."""
-        self.environment_settings = EnvironmentSettings(**self.settings['environment'])
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+def get_settings(config_path: Optional[Union[str, Path]] = None) -> Settings:
+    """Return the process-wide ``Settings`` instance, creating it on first use.
+
+    ``config_path`` (or ``$QUANTUM_CONFIG_PATH``) only takes effect on the
+    first call; asking for a different file afterwards is an error.
+    """
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings(config_path)
+    if config_path is not None and Path(config_path) != _settings.config_path:
+        raise ValueError(f"Settings already loaded from {_settings.config_path}, not {config_path}")
+    return _settings
@@ -1,14 +1,17 @@
-import tensorflow as tf
 import numpy as np
+from src.error_correction.trainer import PolicyTrainer, TrainerConfig
 
 class ErrorCorrectionAgent:
-    def __init__(self, state_dim, action_dim):
+    def __init__(self, state_dim, action_dim, trainer_config=None):
         self.state_dim = state_dim
         self.action_dim = action_dim
         self.model = self._build_model()
+        self.trainer_config = trainer_config or TrainerConfig()
+        self._trainer = None
         
     def _build_model(self):
         """Build a simple policy network."""
+        import tensorflow as tf
         model = tf.keras.Sequential([
             tf.keras.layers.Dense(64, activation='relu', input_shape=(self.state_dim,)),
             tf.keras.layers.Dense(32, activation='relu'),
@@ -23,6 +26,26 @@ class ErrorCorrectionAgent:
         action_probs = self.model.predict(state)[0]
         return np.random.choice(self.action_dim, p=action_probs)
         
-    def train(self, states, actions, advantages):
-        """Update the policy based on advantages."""
-        self.model.fit(states, actions, sample_weight=advantages, verbose=0)
+    @property
+    def trainer(self):
+        """Compiled training loop, built on first use."""
+        if self._trainer is None:
+            self._trainer = PolicyTrainer(self.model, config=self.trainer_config)
+        return self._trainer
+
+    def train(self, states, actions, advantages, epochs=1):
+        """Update the policy based on advantages.
+
+        ``actions`` may be one-hot rows or integer action indices. With
+        gradient accumulation, a partial group of batches is only applied
+        once later calls complete it or ``close`` is called.
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 1:
+            actions = np.eye(self.action_dim, dtype=np.float32)[actions.astype(np.int64)]
+        return self.trainer.fit(states, actions, advantages, epochs=epochs)
+
+    def close(self):
+        """Apply any pending accumulated gradients and stop the checkpointer."""
+        if self._trainer is not None:
+            self._trainer.close()
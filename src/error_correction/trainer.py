@@ -0,0 +1,288 @@
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_PATTERN = re.compile(r'^ckpt-(\d+)\.npz$')
+
+@dataclass
+class TrainerConfig:
+    batch_size: int = 64
+    accumulation_steps: int = 1
+    jit_compile: bool = False
+    shuffle_buffer: int = 10000
+    prefetch: Optional[int] = None
+    checkpoint_dir: Optional[str] = None
+    checkpoint_every: int = 1000
+    max_to_keep: int = 3
+    seed: Optional[int] = None
+
+class AsyncCheckpointer:
+    """Writes weight snapshots on a background thread.
+
+    The caller hands over host copies of the weights, so the learner only
+    pays for the device-to-host transfer. At most one write is in flight;
+    a save requested while the previous one is still running is skipped
+    rather than queued, so slow storage never stalls or grows memory.
+    """
+
+    def __init__(self, directory: str, max_to_keep: int = 3):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_to_keep = max_to_keep
+        self.saved = 0
+        self.skipped = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self._pending: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    def save(self, step: int, arrays: List[np.ndarray]) -> Optional[Future]:
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                self.skipped += 1
+                logger.debug(f"Checkpoint at step {step} skipped; previous write still running")
+                return None
+            self._pending = self._executor.submit(self._write, step, arrays)
+            return self._pending
+
+    def _write(self, step: int, arrays: List[np.ndarray]) -> Path:
+        path = self.directory / f"ckpt-{step:010d}.npz"
+        staging = path.with_name(f"{path.name}.tmp")
+        with open(staging, 'wb') as f:
+            np.savez(f, step=np.int64(step), **{f"w{i}": a for i, a in enumerate(arrays)})
+        os.replace(staging, path)
+        self.saved += 1
+        for stale in self.checkpoints()[:-self.max_to_keep]:
+            stale.unlink(missing_ok=True)
+        return path
+
+    def checkpoints(self) -> List[Path]:
+        """Complete checkpoints, oldest first."""
+        return sorted(p for p in self.directory.iterdir() if CHECKPOINT_PATTERN.match(p.name))
+
+    def latest(self) -> Optional[Path]:
+        checkpoints = self.checkpoints()
+        return checkpoints[-1] if checkpoints else None
+
+    @staticmethod
+    def load(path: Path) -> Tuple[int, List[np.ndarray]]:
+        with np.load(path) as data:
+            count = len(data.files) - 1
+            return int(data['step']), [data[f"w{i}"] for i in range(count)]
+
+    def wait(self) -> None:
+        """Block until the in-flight write, if any, has finished."""
+        pending = self._pending
+        if pending is not None:
+            pending.result()
+
+    def close(self) -> None:
+        self.wait()
+        self._executor.shutdown(wait=True)
+
+class PolicyTrainer:
+    """Compiled training loop for Keras policy networks.
+
+    Replaces per-update ``model.fit`` calls: gradients are computed by a
+    ``tf.function`` traced once for a dynamic batch dimension (optionally
+    XLA-compiled), batches come from a prefetching ``tf.data`` pipeline
+    over NumPy buffers, gradients can be accumulated over several
+    micro-batches per optimizer update, and weights are checkpointed in the
+    background every ``checkpoint_every`` updates.
+
+    Inputs that fit in one batch skip ``tf.data`` and go straight to the
+    compiled step. Accumulated micro-batches carry over between ``fit``
+    calls, so one small batch per call still groups into full updates; call
+    ``flush`` (or ``close``) to apply an incomplete group.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        loss: Any = None,
+        config: Optional[TrainerConfig] = None,
+        optimizer: Any = None
+    ):
+        import tensorflow as tf
+
+        self.model = model
+        self.config = replace(config) if config else TrainerConfig()
+        if self.config.batch_size <= 0 or self.config.accumulation_steps <= 0:
+            raise ValueError("batch_size and accumulation_steps must be positive")
+        self.loss = tf.keras.losses.get(loss or getattr(model, 'loss', None) or 'mse')
+        self.optimizer = optimizer or getattr(model, 'optimizer', None) or tf.keras.optimizers.Adam()
+        self.checkpointer = (AsyncCheckpointer(self.config.checkpoint_dir, self.config.max_to_keep)
+                             if self.config.checkpoint_dir else None)
+        self.updates = 0
+        self.stats = {'updates': 0, 'samples': 0, 'elapsed': 0.0}
+        self._pending_batches = 0
+        self._steps: Optional[Tuple[Any, Any, Any]] = None
+
+    def _build_steps(self, state_shape: Tuple[int, ...], target_shape: Tuple[int, ...]) -> None:
+        import tensorflow as tf
+
+        model, loss_fn, optimizer = self.model, self.loss, self.optimizer
+        variables = model.trainable_variables
+        signature = [
+            tf.TensorSpec(shape=(None,) + state_shape, dtype=tf.float32),
+            tf.TensorSpec(shape=(None,) + target_shape, dtype=tf.float32),
+            tf.TensorSpec(shape=(None,), dtype=tf.float32),
+        ]
+
+        @tf.function(input_signature=signature, jit_compile=self.config.jit_compile)
+        def compute_gradients(states, targets, weights):
+            with tf.GradientTape() as tape:
+                predictions = model(states, training=True)
+                loss = loss_fn(targets, predictions, sample_weight=weights)
+            return loss, tape.gradient(loss, variables)
+
+        @tf.function(input_signature=signature)
+        def train_step(states, targets, weights):
+            loss, gradients = compute_gradients(states, targets, weights)
+            optimizer.apply_gradients(zip(gradients, variables))
+            return loss
+
+        accumulators = [tf.Variable(tf.zeros_like(v), trainable=False) for v in variables]
+
+        @tf.function(input_signature=signature)
+        def accumulate_step(states, targets, weights):
+            loss, gradients = compute_gradients(states, targets, weights)
+            for accumulator, gradient in zip(accumulators, gradients):
+                accumulator.assign_add(gradient)
+            return loss
+
+        @tf.function(input_signature=[tf.TensorSpec(shape=(), dtype=tf.float32)])
+        def apply_accumulated(count):
+            optimizer.apply_gradients(zip([a / count for a in accumulators], variables))
+            for accumulator in accumulators:
+                accumulator.assign(tf.zeros_like(accumulator))
+
+        self._steps = (train_step, accumulate_step, apply_accumulated)
+
+    @staticmethod
+    def _as_arrays(
+        states: np.ndarray,
+        targets: np.ndarray,
+        weights: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        states = np.asarray(states, dtype=np.float32)
+        targets = np.asarray(targets, dtype=np.float32)
+        weights = (np.ones(len(states), dtype=np.float32) if weights is None
+                   else np.asarray(weights, dtype=np.float32).reshape(-1))
+        return states, targets, weights
+
+    def make_dataset(
+        self,
+        states: np.ndarray,
+        targets: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        shuffle: bool = True
+    ) -> Any:
+        """Batched, prefetching ``tf.data`` pipeline over in-memory arrays."""
+        import tensorflow as tf
+
+        states, targets, weights = self._as_arrays(states, targets, weights)
+        dataset = tf.data.Dataset.from_tensor_slices((states, targets, weights))
+        if shuffle and len(states) > 1:
+            dataset = dataset.shuffle(min(self.config.shuffle_buffer, len(states)),
+                                      seed=self.config.seed, reshuffle_each_iteration=True)
+        dataset = dataset.batch(self.config.batch_size)
+        prefetch = self.config.prefetch if self.config.prefetch is not None else tf.data.AUTOTUNE
+        return dataset.prefetch(prefetch)
+
+    def train_on_batch(self, states: Any, targets: Any, weights: Any) -> float:
+        """Run one micro-batch; the optimizer steps every ``accumulation_steps`` calls."""
+        if self._steps is None:
+            self._build_steps(tuple(states.shape[1:]), tuple(targets.shape[1:]))
+        train_step, accumulate_step, _ = self._steps
+        if self.config.accumulation_steps == 1:
+            loss = train_step(states, targets, weights)
+            self._finish_update()
+        else:
+            loss = accumulate_step(states, targets, weights)
+            self._pending_batches += 1
+            if self._pending_batches == self.config.accumulation_steps:
+                self.flush()
+        self.stats['samples'] += int(states.shape[0])
+        return loss
+
+    def flush(self) -> None:
+        """Apply gradients accumulated from an incomplete group of micro-batches."""
+        if self._pending_batches == 0:
+            return
+        import tensorflow as tf
+
+        _, _, apply_accumulated = self._steps
+        apply_accumulated(tf.constant(self._pending_batches, dtype=tf.float32))
+        self._pending_batches = 0
+        self._finish_update()
+
+    def _finish_update(self) -> None:
+        self.updates += 1
+        self.stats['updates'] += 1
+        if self.checkpointer is not None and self.updates % self.config.checkpoint_every == 0:
+            self.save_checkpoint()
+
+    def fit(
+        self,
+        states: np.ndarray,
+        targets: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        epochs: int = 1
+    ) -> Dict[str, float]:
+        """Train for ``epochs`` passes over the arrays and return the mean loss.
+
+        A trailing incomplete accumulation group stays pending for the next
+        call; see ``flush``.
+        """
+        import tensorflow as tf
+
+        start = time.perf_counter()
+        arrays = self._as_arrays(states, targets, weights)
+        if 0 < len(arrays[0]) <= self.config.batch_size:
+            # A single batch gains nothing from shuffling or prefetching.
+            dataset = [tuple(tf.convert_to_tensor(a) for a in arrays)]
+        else:
+            dataset = self.make_dataset(*arrays)
+        total, batches = 0.0, 0
+        for _ in range(epochs):
+            for batch_states, batch_targets, batch_weights in dataset:
+                loss = self.train_on_batch(batch_states, batch_targets, batch_weights)
+                total += float(loss)
+                batches += 1
+        self.stats['elapsed'] += time.perf_counter() - start
+        return {'loss': total / batches if batches else 0.0, 'updates': self.updates}
+
+    def updates_per_sec(self) -> float:
+        if not self.stats['elapsed']:
+            return 0.0
+        return self.stats['updates'] / self.stats['elapsed']
+
+    def save_checkpoint(self) -> Optional[Future]:
+        if self.checkpointer is None:
+            return None
+        return self.checkpointer.save(self.updates, self.model.get_weights())
+
+    def restore_latest(self) -> bool:
+        """Load the newest checkpoint into the model, if one exists."""
+        if self.checkpointer is None:
+            return False
+        latest = self.checkpointer.latest()
+        if latest is None:
+            return False
+        self.updates, weights = self.checkpointer.load(latest)
+        self.model.set_weights(weights)
+        return True
+
+    def close(self) -> None:
+        self.flush()
+        if self.checkpointer is not None:
+            self.checkpointer.close()
@@ -0,0 +1,22 @@
+"""Hybrid quantum/classical task scheduling."""
+from src.hybrid_control.scheduler import (
+    HybridScheduler,
+    SchedulerConfig,
+    SchedulerError,
+    SchedulerClosedError,
+    Task,
+    CostModel,
+    QUANTUM,
+    CLASSICAL,
+)
+
+__all__ = [
+    'HybridScheduler',
+    'SchedulerConfig',
+    'SchedulerError',
+    'SchedulerClosedError',
+    'Task',
+    'CostModel',
+    'QUANTUM',
+    'CLASSICAL',
+]
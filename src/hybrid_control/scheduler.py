@@ -0,0 +1,369 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+QUANTUM = 'quantum'
+CLASSICAL = 'classical'
+RESOURCES = (QUANTUM, CLASSICAL)
+
+BatchExecutor = Callable[[List['Task']], List[Any]]
+
+class SchedulerError(Exception):
+    """Base exception for hybrid scheduler errors."""
+    pass
+
+class SchedulerClosedError(SchedulerError):
+    """Raised when submitting to a scheduler that has been shut down."""
+    pass
+
+@dataclass
+class SchedulerConfig:
+    complexity_threshold: float = 0.7
+    noise_threshold: float = 0.1
+    quantum_volume_min: int = 32
+    quantum_workers: int = 1
+    classical_workers: int = 4
+    max_queue_size: int = 1024
+    batch_size: int = 16
+    batch_timeout: float = 0.005
+    latency_smoothing: float = 0.2
+
+    @classmethod
+    def from_yaml(cls, config_path: Optional[str] = None, **overrides: Any) -> 'SchedulerConfig':
+        """Build a config using the ``hybrid_control`` section of config.yaml as defaults.
+
+        Without ``config_path`` the section comes from the process-wide
+        settings snapshot.
+        """
+        from src.config.settings import get_settings, load_yaml
+
+        config = load_yaml(config_path) if config_path else get_settings().settings
+        return cls.from_section(config.get('hybrid_control', {}), **overrides)
+
+    @classmethod
+    def from_section(cls, section: Mapping[str, Any], **overrides: Any) -> 'SchedulerConfig':
+        thresholds = section.get('thresholds', {})
+        values = {
+            'complexity_threshold': thresholds.get('complexity', cls.complexity_threshold),
+            'noise_threshold': thresholds.get('noise', cls.noise_threshold),
+            'quantum_volume_min': section.get('quantum_volume_min', cls.quantum_volume_min),
+        }
+        values.update(overrides)
+        return cls(**values)
+
+@dataclass
+class Task:
+    complexity: float
+    payload: Any = None
+    task_id: int = field(default_factory=itertools.count().__next__)
+    resource: Optional[str] = None
+    submitted_at: float = 0.0
+    future: Future = field(default_factory=Future, repr=False)
+
+@dataclass
+class PoolStats:
+    workers: int
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    batches: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    busy_time: float = 0.0
+
+class CostModel:
+    """Estimates per-task service time on each resource from measured latencies.
+
+    Latencies are tracked per unit of task complexity as an exponentially
+    weighted moving average, so the estimate follows the current load and
+    noise conditions rather than a fixed prior.
+    """
+
+    def __init__(self, smoothing: float = 0.2, prior: float = 1.0):
+        self.smoothing = smoothing
+        self.latency_per_unit = {resource: prior for resource in RESOURCES}
+        self._lock = threading.Lock()
+
+    def estimate(self, resource: str, complexity: float) -> float:
+        return self.latency_per_unit[resource] * max(complexity, 1e-6)
+
+    def observe(self, resource: str, tasks: List[Task], elapsed: float) -> None:
+        """Fold a measured batch latency into the running estimate."""
+        total_complexity = sum(max(task.complexity, 1e-6) for task in tasks)
+        sample = elapsed / total_complexity
+        with self._lock:
+            current = self.latency_per_unit[resource]
+            self.latency_per_unit[resource] = current + self.smoothing * (sample - current)
+
+class HybridScheduler:
+    """Dispatches a stream of tasks across quantum-simulator and classical pools.
+
+    Each pool has its own bounded queue and worker threads. Workers drain up
+    to ``batch_size`` tasks at a time and hand them to the pool's batch
+    executor; ``submit`` blocks when the chosen queue is full, which applies
+    backpressure to producers instead of buffering without bound.
+
+    Without an explicit ``config`` the scheduler follows the process-wide
+    settings: it watches the config file while running and picks up new
+    routing thresholds from each reloaded snapshot.
+    """
+
+    def __init__(
+        self,
+        quantum_executor: BatchExecutor,
+        classical_executor: BatchExecutor,
+        config: Optional[SchedulerConfig] = None,
+        available_quantum_volume: Optional[int] = None
+    ):
+        self._settings = None
+        if config is None:
+            from src.config.settings import get_settings
+
+            self._settings = get_settings()
+            self._snapshot = self._settings.snapshot
+            config = SchedulerConfig.from_section(self._snapshot.raw.get('hybrid_control', {}))
+        self.config = config
+        self.executors = {QUANTUM: quantum_executor, CLASSICAL: classical_executor}
+        self.available_quantum_volume = (
+            available_quantum_volume if available_quantum_volume is not None
+            else self.config.quantum_volume_min
+        )
+        self.system_noise = 0.0
+        self.cost_model = CostModel(smoothing=self.config.latency_smoothing)
+        self.queues = {
+            resource: queue.Queue(maxsize=self.config.max_queue_size) for resource in RESOURCES
+        }
+        self.stats = {
+            QUANTUM: PoolStats(workers=self.config.quantum_workers),
+            CLASSICAL: PoolStats(workers=self.config.classical_workers),
+        }
+        self._queued_complexity = {resource: 0.0 for resource in RESOURCES}
+        self._active_workers = {resource: 0 for resource in RESOURCES}
+        self._stats_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        # Held while enqueuing and while closing, so no task can land in a
+        # queue after the workers have been told to drain and exit.
+        self._submit_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._started_at: Optional[float] = None
+
+    def __enter__(self) -> 'HybridScheduler':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+    def start(self) -> None:
+        """Start the worker threads for both pools."""
+        with self._start_lock:
+            if self._workers:
+                return
+            self._started_at = time.perf_counter()
+            if self._settings is not None:
+                self._settings.watch()
+            for resource in RESOURCES:
+                for i in range(self.stats[resource].workers):
+                    worker = threading.Thread(
+                        target=self._worker_loop, args=(resource,),
+                        name=f"{resource}-worker-{i}", daemon=True
+                    )
+                    worker.start()
+                    self._workers.append(worker)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting tasks; workers exit once their queues are drained."""
+        with self._submit_lock:
+            self._closed.set()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = []
+
+    def update_noise(self, system_noise: float) -> None:
+        """Record the latest measured system noise level."""
+        self.system_noise = system_noise
+
+    def update_quantum_volume(self, available_quantum_volume: int) -> None:
+        """Record the quantum volume currently available to the simulator pool."""
+        self.available_quantum_volume = available_quantum_volume
+
+    def quantum_eligible(self, complexity: float) -> bool:
+        """Whether a task may run on the quantum pool under current conditions.
+
+        Includes both conditions of ``hybrid_control.decide_allocation``
+        (noise below threshold, quantum volume above the task complexity),
+        plus the configured minimum volume and complexity.
+        """
+        return (self.system_noise < self.config.noise_threshold
+                and self.available_quantum_volume > complexity
+                and self.available_quantum_volume >= self.config.quantum_volume_min
+                and complexity >= self.config.complexity_threshold)
+
+    def _refresh_thresholds(self) -> None:
+        """Adopt routing thresholds from a hot-reloaded settings snapshot."""
+        if self._settings is None or self._settings.snapshot is self._snapshot:
+            return
+        self._snapshot = self._settings.snapshot
+        fresh = SchedulerConfig.from_section(self._snapshot.raw.get('hybrid_control', {}))
+        self.config = replace(self.config, complexity_threshold=fresh.complexity_threshold,
+                              noise_threshold=fresh.noise_threshold,
+                              quantum_volume_min=fresh.quantum_volume_min)
+        logger.info(f"Scheduler thresholds reloaded: {fresh}")
+
+    def estimate_completion(self, resource: str, complexity: float) -> float:
+        """Expected time until a new task would finish on ``resource``."""
+        workers = max(self.stats[resource].workers, 1)
+        backlog = self._queued_complexity[resource] / workers
+        return (backlog * self.cost_model.latency_per_unit[resource]
+                + self.cost_model.estimate(resource, complexity))
+
+    def is_idle(self, resource: str) -> bool:
+        """Whether ``resource`` has an idle worker and nothing queued."""
+        return (self.queues[resource].empty()
+                and self._active_workers[resource] < self.stats[resource].workers)
+
+    def choose_resource(self, complexity: float) -> str:
+        """Pick the pool with the lowest expected completion time.
+
+        An idle pool always wins over a busy one so that neither pool sits
+        unused while the other has a backlog.
+        """
+        self._refresh_thresholds()
+        if not self.quantum_eligible(complexity) or self.stats[QUANTUM].workers == 0:
+            return CLASSICAL
+        if self.stats[CLASSICAL].workers == 0:
+            return QUANTUM
+        idle = [resource for resource in RESOURCES if self.is_idle(resource)]
+        candidates = idle if len(idle) == 1 else RESOURCES
+        return min(candidates, key=lambda resource: self.estimate_completion(resource, complexity))
+
+    def submit(self, complexity: float, payload: Any = None,
+               timeout: Optional[float] = None) -> Future:
+        """Queue a task and return a future for its result.
+
+        Blocks while the selected pool's queue is full; raises ``queue.Full``
+        if ``timeout`` expires first. A blocked submit also delays
+        ``shutdown`` until the workers make room.
+        """
+        with self._submit_lock:
+            if self._closed.is_set():
+                raise SchedulerClosedError("Scheduler has been shut down")
+            if not self._workers:
+                self.start()
+            task = Task(complexity=complexity, payload=payload)
+            task.resource = self.choose_resource(complexity)
+            task.submitted_at = time.perf_counter()
+            with self._stats_lock:
+                self._queued_complexity[task.resource] += complexity
+            try:
+                self.queues[task.resource].put(task, timeout=timeout)
+            except queue.Full:
+                with self._stats_lock:
+                    self._queued_complexity[task.resource] -= complexity
+                raise
+        with self._stats_lock:
+            self.stats[task.resource].submitted += 1
+        return task.future
+
+    def submit_many(self, tasks: Iterable[Any]) -> List[Future]:
+        """Submit ``(complexity, payload)`` pairs from a stream of tasks."""
+        return [self.submit(complexity, payload) for complexity, payload in tasks]
+
+    def _next_batch(self, resource: str) -> List[Task]:
+        """Block for one task, then gather up to ``batch_size`` within the batch timeout."""
+        task_queue = self.queues[resource]
+        while True:
+            try:
+                batch = [task_queue.get(timeout=0.05)]
+                break
+            except queue.Empty:
+                if self._closed.is_set():
+                    return []
+        deadline = time.perf_counter() + self.config.batch_timeout
+        while len(batch) < self.config.batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(task_queue.get(timeout=remaining))
+                else:
+                    batch.append(task_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker_loop(self, resource: str) -> None:
+        executor = self.executors[resource]
+        while True:
+            batch = self._next_batch(resource)
+            if not batch:
+                return
+            with self._stats_lock:
+                self._active_workers[resource] += 1
+                self._queued_complexity[resource] = max(
+                    0.0, self._queued_complexity[resource] - sum(task.complexity for task in batch))
+            started = time.perf_counter()
+            waits = [started - task.submitted_at for task in batch]
+            try:
+                results = executor(batch)
+                if len(results) != len(batch):
+                    raise SchedulerError(
+                        f"{resource} executor returned {len(results)} results for {len(batch)} tasks")
+                error = None
+            except Exception as e:
+                logger.error(f"{resource} batch of {len(batch)} tasks failed: {e}")
+                error = e
+            elapsed = time.perf_counter() - started
+
+            if error is None:
+                # Failed batches often fail fast; their latency says nothing
+                # about the cost of real work.
+                self.cost_model.observe(resource, batch, elapsed)
+            with self._stats_lock:
+                self._active_workers[resource] -= 1
+                stats = self.stats[resource]
+                stats.batches += 1
+                stats.busy_time += elapsed
+                stats.total_wait += sum(waits)
+                stats.max_wait = max(stats.max_wait, max(waits))
+                if error is None:
+                    stats.completed += len(batch)
+                else:
+                    stats.failed += len(batch)
+
+            for i, task in enumerate(batch):
+                if error is None:
+                    task.future.set_result(results[i])
+                else:
+                    task.future.set_exception(error)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Queue depth, wait time, batch size and utilization for each pool."""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        metrics = {}
+        with self._stats_lock:
+            for resource in RESOURCES:
+                stats = self.stats[resource]
+                finished = stats.completed + stats.failed
+                capacity = elapsed * stats.workers
+                metrics[resource] = {
+                    'queue_depth': self.queues[resource].qsize(),
+                    'submitted': stats.submitted,
+                    'completed': stats.completed,
+                    'failed': stats.failed,
+                    'avg_wait_time': stats.total_wait / finished if finished else 0.0,
+                    'max_wait_time': stats.max_wait,
+                    'avg_batch_size': finished / stats.batches if stats.batches else 0.0,
+                    'utilization': stats.busy_time / capacity if capacity else 0.0,
+                    'throughput': finished / elapsed if elapsed else 0.0,
+                    'latency_per_unit': self.cost_model.latency_per_unit[resource],
+                }
+        return metrics
@@ -0,0 +1,20 @@
+"""AI-driven materials discovery."""
+from src.materials_discovery.pipeline import (
+    ScreeningPipeline,
+    ScreeningConfig,
+    ScreeningError,
+    CandidateHasher,
+    HashFilter,
+    TopKBuffer,
+    compile_generator,
+)
+
+__all__ = [
+    'ScreeningPipeline',
+    'ScreeningConfig',
+    'ScreeningError',
+    'CandidateHasher',
+    'HashFilter',
+    'TopKBuffer',
+    'compile_generator',
+]
@@ -0,0 +1,284 @@
+import logging
+import math
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ScoreFn = Callable[[np.ndarray], np.ndarray]
+FilterFn = Callable[[np.ndarray], np.ndarray]
+
+class ScreeningError(Exception):
+    """Raised when the screening pipeline is misconfigured."""
+    pass
+
+@dataclass
+class ScreeningConfig:
+    latent_dim: int = 20
+    batch_size: int = 8192
+    top_k: int = 100
+    min_score: Optional[float] = None
+    dedup_decimals: int = 3
+    output_dir: Optional[str] = None
+    chunk_size: int = 65536
+    written_capacity: int = 10_000_000
+    written_error_rate: float = 1e-3
+    jit_compile: bool = False
+    seed: Optional[int] = None
+
+def compile_generator(generator: Any, latent_dim: int, jit_compile: bool = False) -> Callable[[np.ndarray], np.ndarray]:
+    """Wrap a Keras generator in a traced ``tf.function`` for batched inference.
+
+    The input signature has a dynamic batch dimension, so the graph is traced
+    once and reused for every batch. Plain callables are returned unchanged.
+    """
+    if not hasattr(generator, 'trainable_variables'):
+        return generator
+
+    import tensorflow as tf
+
+    @tf.function(
+        input_signature=[tf.TensorSpec(shape=[None, latent_dim], dtype=tf.float32)],
+        jit_compile=jit_compile
+    )
+    def infer(latents):
+        return generator(latents, training=False)
+
+    return lambda latents: infer(latents).numpy()
+
+class CandidateHasher:
+    """Vectorized 64-bit row hashing of quantized candidate vectors."""
+
+    def __init__(self, dim: int, decimals: int = 3, seed: int = 0x5EED):
+        self.scale = 10.0 ** decimals
+        rng = np.random.default_rng(seed)
+        # Odd multipliers keep every coordinate significant modulo 2**64.
+        self.multipliers = rng.integers(1, 2 ** 63, size=dim, dtype=np.uint64) | np.uint64(1)
+
+    def __call__(self, candidates: np.ndarray) -> np.ndarray:
+        quantized = np.rint(candidates * self.scale).astype(np.int64).view(np.uint64)
+        mixed = quantized * self.multipliers
+        mixed ^= mixed >> np.uint64(29)
+        return np.bitwise_xor.reduce(mixed * self.multipliers, axis=1)
+
+class HashFilter:
+    """Fixed-size Bloom filter over 64-bit candidate hashes.
+
+    Remembers which candidates were already written across batches in
+    ``~1.44 * log2(1/error_rate)`` bits per item, independent of how many
+    candidates stream through. False positives drop a small fraction of
+    new candidates; nothing is ever written twice.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-3):
+        bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_bits = np.uint64(bits)
+        self.num_hashes = max(1, round(bits / capacity * math.log(2)))
+        self.bits = np.zeros((bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        # Double hashing: position_i = h1 + i * h2 (mod m).
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps * h2[:, None]) % self.num_bits
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Boolean mask of hashes that were (probably) added before."""
+        positions = self._positions(hashes)
+        present = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return present.all(axis=1)
+
+    def add(self, hashes: np.ndarray) -> None:
+        positions = self._positions(hashes).ravel()
+        masks = np.left_shift(1, (positions & np.uint64(7)).astype(np.uint8)).astype(np.uint8)
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), masks)
+
+class TopKBuffer:
+    """Bounded top-K store with vectorized batch merges.
+
+    Equivalent to a size-K min-heap, but merges a whole batch with one
+    ``argpartition`` instead of pushing rows one at a time.
+    """
+
+    def __init__(self, k: int, dim: int):
+        self.k = k
+        self.scores = np.empty(0, dtype=np.float32)
+        self.candidates = np.empty((0, dim), dtype=np.float32)
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def threshold(self) -> float:
+        """Lowest score that can still enter the buffer."""
+        if len(self.scores) < self.k:
+            return -np.inf
+        return float(self.scores.min())
+
+    def push(self, candidates: np.ndarray, scores: np.ndarray, hashes: np.ndarray) -> None:
+        keep = (scores > self.threshold) & ~np.isin(hashes, self.hashes)
+        if not keep.any():
+            return
+        scores = np.concatenate([self.scores, scores[keep]])
+        candidates = np.concatenate([self.candidates, candidates[keep]])
+        hashes = np.concatenate([self.hashes, hashes[keep]])
+        if len(scores) > self.k:
+            top = np.argpartition(scores, -self.k)[-self.k:]
+            scores, candidates, hashes = scores[top], candidates[top], hashes[top]
+        self.scores, self.candidates, self.hashes = scores, candidates, hashes
+
+    def results(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidates and scores sorted from best to worst."""
+        order = np.argsort(self.scores)[::-1]
+        return self.candidates[order], self.scores[order]
+
+class ChunkWriter:
+    """Accumulates survivors in a preallocated buffer and flushes fixed-size chunks."""
+
+    def __init__(self, output_dir: str, dim: int, chunk_size: int):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.candidates = np.empty((chunk_size, dim), dtype=np.float32)
+        self.scores = np.empty(chunk_size, dtype=np.float32)
+        self.size = 0
+        self.chunks_written = 0
+        self.rows_written = 0
+
+    def write(self, candidates: np.ndarray, scores: np.ndarray) -> None:
+        start = 0
+        while start < len(scores):
+            n = min(len(scores) - start, len(self.scores) - self.size)
+            self.candidates[self.size:self.size + n] = candidates[start:start + n]
+            self.scores[self.size:self.size + n] = scores[start:start + n]
+            self.size += n
+            start += n
+            if self.size == len(self.scores):
+                self.flush()
+
+    def flush(self) -> None:
+        if self.size == 0:
+            return
+        path = self.output_dir / f"candidates_{self.chunks_written:05d}.npz"
+        np.savez(path, candidates=self.candidates[:self.size], scores=self.scores[:self.size])
+        self.chunks_written += 1
+        self.rows_written += self.size
+        self.size = 0
+
+class ScreeningPipeline:
+    """Streaming candidate generation and screening.
+
+    Each iteration samples a batch of latent vectors, runs the generator,
+    drops invalid and duplicate candidates, scores the rest with the
+    pluggable property model and merges them into a bounded top-K buffer.
+    Memory use is bounded by one batch plus the top-K and write buffers,
+    independent of how many candidates are screened.
+    """
+
+    def __init__(
+        self,
+        generator: Any,
+        score_fn: ScoreFn,
+        config: Optional[ScreeningConfig] = None,
+        filter_fn: Optional[FilterFn] = None
+    ):
+        self.config = replace(config) if config else ScreeningConfig()
+        if self.config.batch_size <= 0 or self.config.top_k <= 0:
+            raise ScreeningError("batch_size and top_k must be positive")
+        if self.config.output_dir and self.config.min_score is None:
+            raise ScreeningError("output_dir requires min_score; otherwise every unique candidate is written")
+        input_shape = getattr(generator, 'input_shape', None)
+        if input_shape is not None:
+            self.config.latent_dim = int(input_shape[-1])
+        self.generate = compile_generator(generator, self.config.latent_dim, self.config.jit_compile)
+        self.score_fn = score_fn
+        self.filter_fn = filter_fn
+        self.rng = np.random.default_rng(self.config.seed)
+        self.hasher: Optional[CandidateHasher] = None
+        self.top_k: Optional[TopKBuffer] = None
+        self.writer: Optional[ChunkWriter] = None
+        self.written: Optional[HashFilter] = None
+        self.stats = {'generated': 0, 'valid': 0, 'unique': 0, 'scored': 0, 'elapsed': 0.0}
+
+    def _setup(self, dim: int) -> None:
+        self.hasher = CandidateHasher(dim, self.config.dedup_decimals)
+        self.top_k = TopKBuffer(self.config.top_k, dim)
+        if self.config.output_dir:
+            self.writer = ChunkWriter(self.config.output_dir, dim, self.config.chunk_size)
+            self.written = HashFilter(self.config.written_capacity, self.config.written_error_rate)
+
+    def screen_batch(self, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate, filter, deduplicate and score one batch."""
+        latents = self.rng.standard_normal((batch_size, self.config.latent_dim), dtype=np.float32)
+        candidates = np.asarray(self.generate(latents), dtype=np.float32)
+        if self.hasher is None:
+            self._setup(candidates.shape[1])
+        self.stats['generated'] += len(candidates)
+
+        valid = np.isfinite(candidates).all(axis=1)
+        if self.filter_fn is not None:
+            valid &= np.asarray(self.filter_fn(candidates), dtype=bool)
+        candidates = candidates[valid]
+        self.stats['valid'] += len(candidates)
+
+        hashes = self.hasher(candidates)
+        _, first = np.unique(hashes, return_index=True)
+        candidates, hashes = candidates[first], hashes[first]
+        self.stats['unique'] += len(candidates)
+
+        scores = np.asarray(self.score_fn(candidates), dtype=np.float32)
+        self.stats['scored'] += len(scores)
+        self.top_k.push(candidates, scores, hashes)
+
+        if self.config.min_score is not None:
+            keep = scores >= self.config.min_score
+            candidates, scores, hashes = candidates[keep], scores[keep], hashes[keep]
+        if self.writer is not None:
+            # Within-batch duplicates are already gone; drop repeats of
+            # candidates written by earlier batches.
+            fresh = ~self.written.contains(hashes)
+            self.written.add(hashes[fresh])
+            self.writer.write(candidates[fresh], scores[fresh])
+        return candidates, scores
+
+    def stream(self, num_candidates: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Screen ``num_candidates`` generated candidates, yielding each batch's survivors."""
+        remaining = num_candidates
+        start = time.perf_counter()
+        try:
+            while remaining > 0:
+                batch_size = min(self.config.batch_size, remaining)
+                yield self.screen_batch(batch_size)
+                remaining -= batch_size
+        finally:
+            if self.writer is not None:
+                self.writer.flush()
+            self.stats['elapsed'] += time.perf_counter() - start
+
+    def run(self, num_candidates: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Screen ``num_candidates`` and return the top-K candidates and scores."""
+        for _ in self.stream(num_candidates):
+            pass
+        if self.top_k is None:
+            return np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32)
+        logger.info(f"Screened {self.stats['generated']} candidates "
+                    f"({self.throughput():.0f}/s), kept top {len(self.top_k)}")
+        return self.top_k.results()
+
+    def throughput(self) -> float:
+        """Generated candidates per second across all runs so far."""
+        if not self.stats['elapsed']:
+            return 0.0
+        return self.stats['generated'] / self.stats['elapsed']
+
+    def get_statistics(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['throughput'] = self.throughput()
+        if self.writer is not None:
+            stats['rows_written'] = self.writer.rows_written
+            stats['chunks_written'] = self.writer.chunks_written
+        return stats
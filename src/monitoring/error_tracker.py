@@ -3,6 +3,8 @@ import time
 from dataclasses import dataclass, field
 from collections import defaultdict
 import logging
+import numpy as np
+from src.monitoring.history import MetricsHistory
 
 @dataclass
 class ErrorEvent:
@@ -15,10 +17,11 @@ class ErrorEvent:
 class ErrorTracker:
     """Tracks and analyzes quantum circuit errors."""
     
-    def __init__(self):
+    def __init__(self, history: Optional[MetricsHistory] = None):
         self.errors: List[ErrorEvent] = []
         self.error_counts = defaultdict(int)
         self.logger = logging.getLogger(__name__)
+        self.history = history
 
     def record_error(self, error_type: str, message: str, 
                     circuit_metadata: Optional[Dict] = None,
@@ -33,8 +36,20 @@ class ErrorTracker:
         )
         self.errors.append(event)
         self.error_counts[error_type] += 1
+        if self.history is not None:
+            self.history.record('errors', 1.0, event.timestamp)
+            self.history.record(f"errors.{error_type}", 1.0, event.timestamp)
         self.logger.error(f"{error_type}: {message}")
 
+    def get_error_history(self, start: float, end: Optional[float] = None,
+                          error_type: Optional[str] = None,
+                          level: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Error counts over time; rollup ``count`` is the number of errors per bucket."""
+        if self.history is None:
+            raise ValueError("ErrorTracker was created without a metrics history")
+        series = 'errors' if error_type is None else f"errors.{error_type}"
+        return self.history.query(series, start, end, level)
+
     def get_error_statistics(self) -> Dict:
         """Get statistical analysis of recorded errors."""
         return {
@@ -0,0 +1,488 @@
+import bisect
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RAW = 'raw'
+MINUTE = 'minute'
+HOUR = 'hour'
+ROLLUP_LEVELS = {MINUTE: 60, HOUR: 3600}
+
+# Quantile sketch: bin 0 holds values <= 2**-16 (including zero and
+# negatives), bins 1..62 are half-octave log buckets up to 2**15 and the
+# last bin holds everything above. Estimates are within ~19% relative
+# error and clamped to the bucket's exact min/max.
+SKETCH_BINS = 64
+SKETCH_MIN_EXPONENT = -16
+SKETCH_BINS_PER_OCTAVE = 2
+SKETCH_MAX_COUNT = np.iinfo(np.uint32).max
+
+RAW_DTYPE = np.dtype([('timestamp', '<f8'), ('series', '<u4'), ('value', '<f8')])
+ROLLUP_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('series', '<u4'),
+    ('count', '<u4'),
+    ('sum', '<f8'),
+    ('min', '<f8'),
+    ('max', '<f8'),
+    ('sketch', '<u4', (SKETCH_BINS,)),
+])
+
+class HistoryError(Exception):
+    """Raised when the metrics history cannot be read or written."""
+    pass
+
+def sketch_bin(value: float) -> int:
+    if not value > 2.0 ** SKETCH_MIN_EXPONENT:
+        return 0
+    index = int(math.floor((math.log2(value) - SKETCH_MIN_EXPONENT) * SKETCH_BINS_PER_OCTAVE)) + 1
+    return min(index, SKETCH_BINS - 1)
+
+def sketch_quantiles(rollups: np.ndarray, quantiles: Sequence[float]) -> Dict[str, np.ndarray]:
+    """Estimate quantiles for every rollup record from its sketch."""
+    cumulative = np.cumsum(rollups['sketch'], axis=1, dtype=np.int64)
+    totals = cumulative[:, -1:]
+    upper = SKETCH_MIN_EXPONENT + np.arange(SKETCH_BINS) / SKETCH_BINS_PER_OCTAVE
+    midpoints = 2.0 ** (upper - 0.5 / SKETCH_BINS_PER_OCTAVE)
+    result = {}
+    for q in quantiles:
+        index = np.argmax(cumulative >= np.maximum(q * totals, 1), axis=1)
+        estimate = midpoints[index]
+        estimate = np.where(index == 0, rollups['min'], estimate)
+        estimate = np.where(index == SKETCH_BINS - 1, rollups['max'], estimate)
+        result[f"p{q * 100:g}"] = np.clip(estimate, rollups['min'], rollups['max'])
+    return result
+
+def merge_rollups(rollups: np.ndarray) -> np.ndarray:
+    """Sort one series' rollups by time and combine records for the same bucket.
+
+    Duplicates appear when a bucket is reopened after a restart or when a
+    late sample arrives after its bucket was flushed.
+    """
+    if len(rollups) < 2:
+        return rollups
+    steps = np.diff(rollups['timestamp'])
+    if (steps > 0).all():
+        return rollups
+    rollups = rollups[np.argsort(rollups['timestamp'], kind='stable')]
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(rollups['timestamp'])) + 1])
+    merged = rollups[starts].copy()
+    merged['count'] = np.add.reduceat(rollups['count'], starts)
+    merged['sum'] = np.add.reduceat(rollups['sum'], starts)
+    merged['min'] = np.minimum.reduceat(rollups['min'], starts)
+    merged['max'] = np.maximum.reduceat(rollups['max'], starts)
+    sketch = np.add.reduceat(rollups['sketch'].astype(np.int64), starts, axis=0)
+    merged['sketch'] = np.minimum(sketch, SKETCH_MAX_COUNT)
+    return merged
+
+class SegmentLog:
+    """Append-only fixed-width records in memory-mapped segment files.
+
+    Records are routed to one file per ``segment_seconds`` period of their
+    timestamp, so reads only touch the periods they overlap and retention
+    deletes whole files. Segment files start small and double in size when
+    full; unused slots are zero and a zero timestamp marks the end of the
+    data. Writes go straight to the shared mapping, so they survive a
+    process crash without an explicit flush.
+    """
+
+    def __init__(self, directory: Path, dtype: np.dtype, segment_seconds: int, initial_capacity: int = 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dtype = dtype
+        self.segment_seconds = segment_seconds
+        self.initial_capacity = initial_capacity
+        self._maps: Dict[int, np.memmap] = {}
+        self._counts: Dict[int, int] = {}
+        self._periods = sorted(int(p.stem) for p in self.directory.glob('*.seg'))
+
+    def _path(self, period: int) -> Path:
+        return self.directory / f"{period:012d}.seg"
+
+    def periods(self) -> List[int]:
+        return list(self._periods)
+
+    def _open(self, period: int, create: bool = False) -> Optional[np.memmap]:
+        data = self._maps.get(period)
+        if data is not None:
+            return data
+        path = self._path(period)
+        if not path.exists():
+            if not create:
+                return None
+            with open(path, 'wb') as f:
+                f.truncate(self.initial_capacity * self.dtype.itemsize)
+            bisect.insort(self._periods, period)
+        data = np.memmap(path, dtype=self.dtype, mode='r+')
+        empty = data['timestamp'] == 0
+        self._counts[period] = int(np.argmax(empty)) if empty.any() else len(data)
+        self._maps[period] = data
+        return data
+
+    def _grow(self, period: int, required: int) -> np.memmap:
+        data = self._maps.pop(period)
+        capacity = max(2 * len(data), required)
+        data.flush()
+        del data
+        with open(self._path(period), 'r+b') as f:
+            f.truncate(capacity * self.dtype.itemsize)
+        return self._open(period)
+
+    def append(self, records: np.ndarray) -> None:
+        periods = (records['timestamp'] // self.segment_seconds).astype(np.int64)
+        for period in np.unique(periods):
+            batch = records[periods == period] if len(records) > 1 else records
+            data = self._open(int(period), create=True)
+            count = self._counts[int(period)]
+            if count + len(batch) > len(data):
+                data = self._grow(int(period), count + len(batch))
+            data[count:count + len(batch)] = batch
+            self._counts[int(period)] = count + len(batch)
+
+    def read(self, start: float, end: float, series: Optional[int] = None) -> np.ndarray:
+        """Copy out records with ``start <= timestamp < end``."""
+        first = int(start // self.segment_seconds)
+        last = int(math.ceil(end / self.segment_seconds))
+        parts = []
+        lo = bisect.bisect_left(self._periods, first)
+        hi = bisect.bisect_left(self._periods, last)
+        for period in self._periods[lo:hi]:
+            data = self._open(period)
+            # Plain ndarray view: memmap subclass overhead dominates small reads.
+            records = data[:self._counts[period]].view(np.ndarray)
+            mask = (records['timestamp'] >= start) & (records['timestamp'] < end)
+            if series is not None:
+                mask &= records['series'] == series
+            parts.append(records[mask])
+        if not parts:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(parts)
+
+    def expire(self, before: float) -> int:
+        """Delete segments whose whole period ends at or before ``before``."""
+        removed = 0
+        while self._periods and (self._periods[0] + 1) * self.segment_seconds <= before:
+            period = self._periods.pop(0)
+            data = self._maps.pop(period, None)
+            self._counts.pop(period, None)
+            del data
+            self._path(period).unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob('*.seg'))
+
+    def flush(self) -> None:
+        for data in self._maps.values():
+            data.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._maps.clear()
+        self._counts.clear()
+
+@dataclass
+class HistoryConfig:
+    retention_days: float = 30.0
+    minute_retention_days: float = 7.0
+    raw_retention_hours: float = 24.0
+
+    @classmethod
+    def from_yaml(cls, config_path: Optional[str] = None, **overrides) -> 'HistoryConfig':
+        """Build a config from ``quantum_environment.monitoring`` in config.yaml.
+
+        Without ``config_path`` the section comes from the process-wide
+        settings snapshot.
+        """
+        from src.config.settings import get_settings, load_yaml
+
+        config = load_yaml(config_path) if config_path else get_settings().settings
+        monitoring = config.get('quantum_environment', {}).get('monitoring', {})
+        values = {'retention_days': monitoring.get('metrics_retention_days', cls.retention_days)}
+        values.update(overrides)
+        return cls(**values)
+
+    def retention_seconds(self, level: str) -> float:
+        if level == RAW:
+            return self.raw_retention_hours * 3600
+        if level == MINUTE:
+            return min(self.minute_retention_days, self.retention_days) * 86400
+        return self.retention_days * 86400
+
+class MetricsHistory:
+    """Time-series store for monitoring metrics.
+
+    Every sample is appended to a raw log and folded into the open minute
+    and hour buckets of its series (count, sum, min, max and a fixed-size
+    quantile sketch). Buckets are written to their level's log once a
+    later sample closes them. Each level has its own retention: raw
+    samples are kept for a day, minute rollups for a week and hour rollups
+    for ``retention_days``, which keeps a month of history to a few MB.
+    Expired segments are deleted whenever a sample opens a new raw
+    segment period, i.e. at most once an hour. Range queries read only the
+    level that matches the requested span.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        config: Optional[HistoryConfig] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.config = config or HistoryConfig.from_yaml()
+        self.clock = clock
+        self.raw = SegmentLog(self.directory / RAW, RAW_DTYPE, segment_seconds=3600)
+        self.rollups = {
+            MINUTE: SegmentLog(self.directory / MINUTE, ROLLUP_DTYPE, segment_seconds=86400),
+            HOUR: SegmentLog(self.directory / HOUR, ROLLUP_DTYPE, segment_seconds=7 * 86400),
+        }
+        self._open_buckets: Dict[Tuple[str, int], np.ndarray] = {}
+        self._series: Dict[str, int] = self._load_series()
+        self._expired_period: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _load_series(self) -> Dict[str, int]:
+        path = self.directory / 'series.json'
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise HistoryError(f"Corrupt series index {path}: {e}")
+
+    def _series_id(self, name: str) -> int:
+        series_id = self._series.get(name)
+        if series_id is None:
+            series_id = len(self._series) + 1
+            self._series[name] = series_id
+            staging = self.directory / 'series.json.tmp'
+            with open(staging, 'w') as f:
+                json.dump(self._series, f)
+            os.replace(staging, self.directory / 'series.json')
+        return series_id
+
+    def series(self) -> List[str]:
+        return sorted(self._series)
+
+    def record(self, name: str, value: float, timestamp: Optional[float] = None) -> None:
+        """Append one sample and update its open rollup buckets.
+
+        Each call costs tens of microseconds (lock, raw append and two
+        bucket updates); hot paths should collect samples and use
+        ``record_many``.
+        """
+        timestamp = self.clock() if timestamp is None else timestamp
+        with self._lock:
+            series_id = self._series_id(name)
+            sample = np.array([(timestamp, series_id, value)], dtype=RAW_DTYPE)
+            self.raw.append(sample)
+            self._update_buckets(series_id, float(timestamp), float(value))
+            removed = self._expire_on_new_period(float(timestamp))
+        self._log_expired(removed)
+
+    def record_many(self, name: str, values: Iterable[float], timestamps: Iterable[float]) -> None:
+        """Append many samples of one series in a single raw write."""
+        with self._lock:
+            series_id = self._series_id(name)
+            values = np.asarray(list(values), dtype=np.float64)
+            samples = np.empty(len(values), dtype=RAW_DTYPE)
+            samples['timestamp'] = np.asarray(list(timestamps), dtype=np.float64)
+            samples['series'] = series_id
+            samples['value'] = values
+            self.raw.append(samples)
+            for timestamp, value in zip(samples['timestamp'].tolist(), values.tolist()):
+                self._update_buckets(series_id, timestamp, value)
+            removed = self._expire_on_new_period(float(samples['timestamp'].max())) if len(samples) else 0
+        self._log_expired(removed)
+
+    def _expire_on_new_period(self, timestamp: float) -> int:
+        """Expire old segments the first time a sample reaches a new raw period.
+
+        The newest sample time stands in for "now", so backfilled history is
+        not deleted by a clock that is ahead of it.
+        """
+        period = int(timestamp // self.raw.segment_seconds)
+        if self._expired_period is not None and period <= self._expired_period:
+            return 0
+        self._expired_period = period
+        return self._expire(timestamp)
+
+    def _update_buckets(self, series_id: int, timestamp: float, value: float) -> None:
+        for level, width in ROLLUP_LEVELS.items():
+            start = int(timestamp // width) * width
+            key = (level, series_id)
+            bucket = self._open_buckets.get(key)
+            if bucket is not None and bucket['timestamp'][0] != start:
+                if start < bucket['timestamp'][0]:
+                    # Late sample for an already flushed bucket: write it on
+                    # its own; queries merge it with the earlier record.
+                    late = self._new_bucket(series_id, start)
+                    self._add_to_bucket(late, value)
+                    self.rollups[level].append(late)
+                    continue
+                self.rollups[level].append(bucket)
+                bucket = None
+            if bucket is None:
+                bucket = self._new_bucket(series_id, start)
+                self._open_buckets[key] = bucket
+            self._add_to_bucket(bucket, value)
+
+    @staticmethod
+    def _new_bucket(series_id: int, start: int) -> np.ndarray:
+        bucket = np.zeros(1, dtype=ROLLUP_DTYPE)
+        bucket['timestamp'] = start
+        bucket['series'] = series_id
+        bucket['min'] = np.inf
+        bucket['max'] = -np.inf
+        return bucket
+
+    @staticmethod
+    def _add_to_bucket(bucket: np.ndarray, value: float) -> None:
+        record = bucket[0]
+        record['count'] += 1
+        record['sum'] += value
+        record['min'] = min(record['min'], value)
+        record['max'] = max(record['max'], value)
+        index = sketch_bin(value)
+        if record['sketch'][index] < SKETCH_MAX_COUNT:
+            record['sketch'][index] += 1
+
+    def choose_level(self, start: float, end: float) -> str:
+        """Finest level that still holds ``start`` and suits the span."""
+        age = self.clock() - start
+        span = end - start
+        if span <= 3600 and age <= self.config.retention_seconds(RAW):
+            return RAW
+        if span <= 2 * 86400 and age <= self.config.retention_seconds(MINUTE):
+            return MINUTE
+        return HOUR
+
+    def _rollups(self, level: str, series_id: int, start: float, end: float) -> np.ndarray:
+        width = ROLLUP_LEVELS[level]
+        first = math.floor(start / width) * width
+        records = self.rollups[level].read(first, end, series_id)
+        bucket = self._open_buckets.get((level, series_id))
+        if bucket is not None and first <= bucket['timestamp'][0] < end:
+            records = np.concatenate([records, bucket])
+        return merge_rollups(records)
+
+    def query(
+        self,
+        name: str,
+        start: float,
+        end: Optional[float] = None,
+        level: Optional[str] = None,
+        quantiles: Sequence[float] = (0.5, 0.95, 0.99)
+    ) -> Dict[str, np.ndarray]:
+        """Samples or rollups of ``name`` in ``[start, end)``.
+
+        Raw queries return ``timestamp`` and ``value`` arrays; rollup
+        queries return bucket start ``timestamp`` with ``count``, ``mean``,
+        ``min``, ``max`` and one array per requested quantile (``p50``...).
+        """
+        end = self.clock() if end is None else end
+        level = level or self.choose_level(start, end)
+        with self._lock:
+            series_id = self._series.get(name)
+            if level == RAW:
+                records = (self.raw.read(start, end, series_id) if series_id is not None
+                           else np.empty(0, dtype=RAW_DTYPE))
+                order = np.argsort(records['timestamp'], kind='stable')
+                return {'timestamp': records['timestamp'][order], 'value': records['value'][order]}
+            if level not in ROLLUP_LEVELS:
+                raise HistoryError(f"Unknown rollup level: {level}")
+            records = (self._rollups(level, series_id, start, end) if series_id is not None
+                       else np.empty(0, dtype=ROLLUP_DTYPE))
+        result = {
+            'timestamp': records['timestamp'].astype(np.float64),
+            'count': records['count'].astype(np.int64),
+            'mean': records['sum'] / np.maximum(records['count'], 1),
+            'min': records['min'],
+            'max': records['max'],
+        }
+        result.update(sketch_quantiles(records, quantiles))
+        return result
+
+    def summary(
+        self,
+        name: str,
+        start: float,
+        end: Optional[float] = None,
+        quantiles: Sequence[float] = (0.5, 0.95, 0.99)
+    ) -> Dict[str, float]:
+        """Aggregate of ``name`` over ``[start, end)`` from a single rollup level."""
+        end = self.clock() if end is None else end
+        level = self.choose_level(start, end)
+        level = MINUTE if level == RAW else level
+        with self._lock:
+            series_id = self._series.get(name)
+            records = (self._rollups(level, series_id, start, end) if series_id is not None
+                       else np.empty(0, dtype=ROLLUP_DTYPE))
+        if len(records) == 0:
+            return {'count': 0}
+        total = np.zeros(1, dtype=ROLLUP_DTYPE)
+        total['count'] = records['count'].sum()
+        total['sum'] = records['sum'].sum()
+        total['min'] = records['min'].min()
+        total['max'] = records['max'].max()
+        total['sketch'] = np.minimum(records['sketch'].astype(np.int64).sum(axis=0), SKETCH_MAX_COUNT)
+        summary = {
+            'count': int(total['count'][0]),
+            'mean': float(total['sum'][0] / total['count'][0]),
+            'min': float(total['min'][0]),
+            'max': float(total['max'][0]),
+        }
+        summary.update({key: float(value[0]) for key, value in sketch_quantiles(total, quantiles).items()})
+        return summary
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Delete segments older than each level's retention; returns the number removed."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            removed = self._expire(now)
+        self._log_expired(removed)
+        return removed
+
+    def _expire(self, now: float) -> int:
+        removed = self.raw.expire(now - self.config.retention_seconds(RAW))
+        for level, log in self.rollups.items():
+            removed += log.expire(now - self.config.retention_seconds(level))
+        return removed
+
+    @staticmethod
+    def _log_expired(removed: int) -> None:
+        if removed:
+            logger.info(f"Expired {removed} metrics history segments")
+
+    def size_bytes(self) -> int:
+        return self.raw.size_bytes() + sum(log.size_bytes() for log in self.rollups.values())
+
+    def flush(self) -> None:
+        """Write open rollup buckets and sync every mapped segment."""
+        with self._lock:
+            for (level, _), bucket in self._open_buckets.items():
+                self.rollups[level].append(bucket)
+            self._open_buckets.clear()
+            self.raw.flush()
+            for log in self.rollups.values():
+                log.flush()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self.raw.close()
+            for log in self.rollups.values():
+                log.close()
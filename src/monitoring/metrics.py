@@ -1,19 +1,36 @@
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, List
 import time
-import psutil
 import logging
-from prometheus_client import Counter, Gauge, Histogram, Summary
 from contextlib import contextmanager
+from src.utils.lazy_import import lazy_import
+
+psutil = lazy_import('psutil')
+prometheus_client = lazy_import('prometheus_client')
+
+class _SharedMetric:
+    """Class-level Prometheus collector that is registered on first access."""
+
+    def __init__(self, metric_type: str, *args: Any, **kwargs: Any):
+        self.metric_type = metric_type
+        self.args = args
+        self.kwargs = kwargs
+        self.metric = None
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if self.metric is None:
+            factory = getattr(prometheus_client, self.metric_type)
+            self.metric = factory(*self.args, **self.kwargs)
+        return self.metric
 
 @dataclass
 class MetricsCollector:
     """Collect and export metrics for monitoring."""
     
-    circuit_executions = Counter('circuit_executions_total', 'Total circuit executions')
-    error_rate = Gauge('error_rate', 'Current error rate')
-    execution_time = Histogram('execution_time_seconds', 'Time spent executing circuits')
-    memory_usage = Gauge('memory_usage_bytes', 'Current memory usage')
+    circuit_executions = _SharedMetric('Counter', 'circuit_executions_total', 'Total circuit executions')
+    error_rate = _SharedMetric('Gauge', 'error_rate', 'Current error rate')
+    execution_time = _SharedMetric('Histogram', 'execution_time_seconds', 'Time spent executing circuits')
+    memory_usage = _SharedMetric('Gauge', 'memory_usage_bytes', 'Current memory usage')
     
     def record_execution(self, circuit_depth: int, execution_time: float):
         """Record metrics for a circuit execution."""
@@ -25,6 +42,26 @@ class MetricsCollector:
         """Record current error rate."""
         self.error_rate.set(error_rate)
 
+@dataclass
+class SimulationServiceMetricsCollector:
+    """Prometheus histograms for the micro-batching simulation service."""
+
+    queue_latency = _SharedMetric('Histogram', 'simulation_queue_latency_seconds',
+                                  'Time requests wait before their batch is dispatched',
+                                  buckets=(.0001, .0005, .001, .002, .005, .01, .05, .1, .5, 1.0))
+    batch_size = _SharedMetric('Histogram', 'simulation_batch_size',
+                               'Requests coalesced per simulation batch',
+                               buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+    batch_latency = _SharedMetric('Histogram', 'simulation_batch_seconds',
+                                  'Time spent simulating one batch')
+
+    def record_batch(self, queue_latencies: List[float], batch_time: float):
+        """Record one dispatched batch."""
+        for latency in queue_latencies:
+            self.queue_latency.observe(latency)
+        self.batch_size.observe(len(queue_latencies))
+        self.batch_latency.observe(batch_time)
+
 class QuantumMetricsCollector:
     def __init__(self):
         self._initialize_metrics()
@@ -32,15 +69,18 @@ class QuantumMetricsCollector:
 
     def _initialize_metrics(self) -> None:
         """Initialize comprehensive metrics collection."""
-        self.circuit_depth = Histogram('circuit_depth', 
-                                     'Circuit depth distribution',
-                                     buckets=(1, 2, 5, 10, 20, 50, 100))
-        self.error_rate = Summary('error_rate', 
-                                'Error rate distribution',
-                                ['error_type'])
-        self.execution_time = Histogram('execution_time_seconds',
-                                      'Circuit execution time',
-                                      buckets=(.001, .005, .01, .05, .1, .5))
+        self.circuit_depth = prometheus_client.Histogram(
+            'circuit_depth',
+            'Circuit depth distribution',
+            buckets=(1, 2, 5, 10, 20, 50, 100))
+        self.error_rate = prometheus_client.Summary(
+            'error_rate',
+            'Error rate distribution',
+            ['error_type'])
+        self.execution_time = prometheus_client.Histogram(
+            'execution_time_seconds',
+            'Circuit execution time',
+            buckets=(.001, .005, .01, .05, .1, .5))
 
     @contextmanager
     def measure_execution_time(self, circuit_id: str):
@@ -1,9 +1,12 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import time
-import psutil
 import numpy as np
 from dataclasses import dataclass, field
 from collections import deque
+from src.utils.lazy_import import lazy_import
+from src.monitoring.history import MetricsHistory
+
+psutil = lazy_import('psutil')
 
 @dataclass
 class PerformanceMetrics:
@@ -12,8 +15,9 @@ class PerformanceMetrics:
     circuit_depths: deque = field(default_factory=lambda: deque(maxlen=1000))
 
 class PerformanceMonitor:
-    def __init__(self, metrics_window: int = 1000):
+    def __init__(self, metrics_window: int = 1000, history: Optional[MetricsHistory] = None):
         self.metrics = PerformanceMetrics()
+        self.history = history
         self.start_time = time.time()
         self.alert_thresholds = {
             'max_execution_time': 5.0,  # seconds
@@ -23,14 +27,26 @@ class PerformanceMonitor:
     
     def record_execution(self, execution_time: float) -> None:
         self.metrics.execution_times.append(execution_time)
+        if self.history is not None:
+            self.history.record('execution_time', execution_time)
     
     def record_memory(self) -> None:
-        self.metrics.memory_usage.append(
-            psutil.Process().memory_info().rss / 1024 / 1024
-        )
+        memory_mb = psutil.Process().memory_info().rss / 1024 / 1024
+        self.metrics.memory_usage.append(memory_mb)
+        if self.history is not None:
+            self.history.record('memory_usage', memory_mb)
     
     def record_circuit_depth(self, depth: int) -> None:
         self.metrics.circuit_depths.append(depth)
+        if self.history is not None:
+            self.history.record('circuit_depth', depth)
+
+    def get_history(self, metric: str, start: float, end: Optional[float] = None,
+                    level: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Long-term history of ``execution_time``, ``memory_usage`` or ``circuit_depth``."""
+        if self.history is None:
+            raise ValueError("PerformanceMonitor was created without a metrics history")
+        return self.history.query(metric, start, end, level)
     
     def get_statistics(self) -> Dict[str, Any]:
         return {
@@ -1,10 +1,138 @@
-from typing import Any, Optional, Union
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple, Union
 from cryptography.fernet import Fernet
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass, field
+import base64
 import hashlib
+import io
+import logging
 import os
+import struct
 from datetime import datetime, timedelta
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.exceptions import InvalidTag
+
+logger = logging.getLogger(__name__)
+
+# Framed stream format used by QuantumSecurity.encrypt_stream:
+#
+#   header: magic | version | reserved | chunk_size | salt | key id
+#   frame*: ciphertext length | flags | AES-256-GCM ciphertext + tag
+#
+# Every frame except the last holds exactly chunk_size bytes of plaintext,
+# so frame i starts at a fixed offset and can be decrypted on its own. A
+# per-stream key is derived from the Fernet key and the random salt, the
+# nonce is the chunk index, and the header, index and flags are bound in as
+# associated data so frames cannot be reordered, spliced or truncated. The
+# key id names the Fernet key the stream was written with; rotate_key keeps
+# retired keys next to the key file so older streams stay readable.
+STREAM_MAGIC = b'QBES'
+STREAM_VERSION = 1
+STREAM_HEADER = struct.Struct('>4sBBI16s8s')
+FRAME_HEADER = struct.Struct('>IB')
+FRAME_AAD = struct.Struct('>QB')
+FRAME_FINAL = 0x01
+GCM_TAG_SIZE = 16
+DEFAULT_STREAM_CHUNK_SIZE = 4 * 1024 * 1024
+
+StreamSource = Union[BinaryIO, bytes, bytearray, memoryview]
+
+class SecurityException(Exception):
+    """Raised when a key, encryption or integrity operation fails."""
+    pass
+
+@dataclass
+class StreamManifest:
+    """Summary of an encrypted stream with per-chunk plaintext digests."""
+    chunk_size: int
+    total_bytes: int = 0
+    digests: List[str] = field(default_factory=list)
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.digests)
+
+def _iter_source_chunks(src: StreamSource, chunk_size: int) -> Iterator[memoryview]:
+    """Yield plaintext chunks from a file object or bytes-like object."""
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        view = memoryview(src).cast('B')
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+        return
+    while True:
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        filled = 0
+        while filled < chunk_size:
+            n = src.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        if filled == 0:
+            return
+        yield view[:filled]
+        if filled < chunk_size:
+            return
+
+class _BufferReader:
+    """Seekable reader over a bytes-like object that returns zero-copy slices.
+
+    ``io.BytesIO`` would copy the whole buffer just to read one frame.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(data).cast('B')
+        self._pos = 0
+
+    def read(self, size: int = -1) -> memoryview:
+        end = len(self._view) if size < 0 else min(self._pos + size, len(self._view))
+        chunk = self._view[self._pos:end]
+        self._pos = max(end, self._pos)
+        return chunk
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(base + offset, 0)
+        return self._pos
+
+def _as_reader(src: StreamSource) -> BinaryIO:
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        return _BufferReader(src)
+    return src
+
+def _key_id(key: bytes) -> bytes:
+    return hashlib.sha256(key).digest()[:8]
+
+def _read_exact(reader: BinaryIO, size: int) -> bytes:
+    data = reader.read(size)
+    if len(data) != size:
+        raise SecurityException("Encrypted stream is truncated")
+    return data
+
+def _read_frame_header(reader: BinaryIO, chunk_size: int) -> Optional[Tuple[int, int]]:
+    """Return (ciphertext length, flags), or None at end of stream.
+
+    The length is unauthenticated, so it is bounds-checked before anything
+    is read or allocated for the ciphertext.
+    """
+    data = reader.read(FRAME_HEADER.size)
+    if not data:
+        return None
+    if len(data) < FRAME_HEADER.size:
+        data = bytes(data) + _read_exact(reader, FRAME_HEADER.size - len(data))
+    length, flags = FRAME_HEADER.unpack(data)
+    if not GCM_TAG_SIZE <= length <= chunk_size + GCM_TAG_SIZE:
+        raise SecurityException(f"Invalid frame length {length}")
+    return length, flags
+
+def _worker_count(max_workers: Optional[int]) -> int:
+    return max_workers or os.cpu_count() or 1
 
 class QuantumSecurity:
     def __init__(self, key_file: Optional[str] = None, key_rotation_days: int = 30):
@@ -27,11 +155,20 @@ class QuantumSecurity:
         self.cipher_suite = Fernet(self.key)
     
     def rotate_key(self) -> None:
-        """Implement secure key rotation"""
+        """Implement secure key rotation
+
+        The retired key is also kept as ``<key_file>.<key id>`` so streams
+        encrypted with it can still be decrypted; deleting those files makes
+        the matching streams unreadable.
+        """
         try:
             new_key = Fernet.generate_key()
             backup_file = f"{self.key_file}.bak"
             if os.path.exists(self.key_file):
+                with open(self.key_file, 'rb') as f:
+                    old_key = f.read()
+                with open(self._retired_key_file(_key_id(old_key)), 'wb') as f:
+                    f.write(old_key)
                 os.rename(self.key_file, backup_file)
             with open(self.key_file, 'wb') as f:
                 f.write(new_key)
@@ -51,6 +188,158 @@ class QuantumSecurity:
     @staticmethod
     def hash_circuit(circuit_data: str) -> str:
         return hashlib.sha256(circuit_data.encode()).hexdigest()
+
+    @staticmethod
+    def hash_chunk(chunk: Union[bytes, memoryview]) -> str:
+        return hashlib.sha256(chunk).hexdigest()
+
+    def _retired_key_file(self, key_id: bytes) -> str:
+        return f"{self.key_file}.{key_id.hex()}"
+
+    def _stream_key(self, key_id: bytes) -> bytes:
+        """Current key, or the retired key a stream was written with."""
+        if key_id == _key_id(self.key):
+            return self.key
+        try:
+            with open(self._retired_key_file(key_id), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            raise SecurityException(f"Stream key {key_id.hex()} is not available") from None
+
+    @staticmethod
+    def _stream_cipher(key: bytes, salt: bytes) -> AESGCM:
+        """Derive the per-stream AES-256-GCM cipher from a Fernet key."""
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt,
+                    info=b'quantum-security-stream')
+        return AESGCM(hkdf.derive(base64.urlsafe_b64decode(key)))
+
+    def _read_stream_header(self, reader: BinaryIO) -> Tuple[bytes, int, AESGCM]:
+        header = bytes(_read_exact(reader, STREAM_HEADER.size))
+        magic, version, _, chunk_size, salt, key_id = STREAM_HEADER.unpack(header)
+        if magic != STREAM_MAGIC or version != STREAM_VERSION:
+            raise SecurityException("Not a supported encrypted stream")
+        return header, chunk_size, self._stream_cipher(self._stream_key(key_id), salt)
+
+    def encrypt_stream(
+        self,
+        src: StreamSource,
+        dst: BinaryIO,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        max_workers: Optional[int] = None
+    ) -> StreamManifest:
+        """Encrypt ``src`` into ``dst`` as independently decryptable chunks.
+
+        Chunks are encrypted on a thread pool and written in order; at most
+        two chunks per worker are in flight, so memory use is bounded by the
+        chunk size rather than the input size.
+        """
+        salt = os.urandom(16)
+        header = STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION, 0, chunk_size, salt, _key_id(self.key))
+        cipher = self._stream_cipher(self.key, salt)
+        manifest = StreamManifest(chunk_size=chunk_size)
+
+        def encrypt_chunk(index: int, chunk: memoryview, flags: int) -> Tuple[bytes, str]:
+            aad = header + FRAME_AAD.pack(index, flags)
+            ciphertext = cipher.encrypt(index.to_bytes(12, 'big'), bytes(chunk), aad)
+            return FRAME_HEADER.pack(len(ciphertext), flags) + ciphertext, self.hash_chunk(chunk)
+
+        try:
+            dst.write(header)
+            workers = _worker_count(max_workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                window = 2 * workers
+                pending = deque()
+                chunks = _iter_source_chunks(src, chunk_size)
+                current = next(chunks, memoryview(b''))
+                index = 0
+                while current is not None:
+                    following = next(chunks, None)
+                    flags = FRAME_FINAL if following is None else 0
+                    pending.append(executor.submit(encrypt_chunk, index, current, flags))
+                    manifest.total_bytes += len(current)
+                    current, index = following, index + 1
+                    while pending and (len(pending) >= window or current is None):
+                        frame, digest = pending.popleft().result()
+                        dst.write(frame)
+                        manifest.digests.append(digest)
+            return manifest
+        except Exception as e:
+            logger.error(f"Stream encryption failed: {str(e)}")
+            raise SecurityException("Stream encryption failed") from e
+
+    def decrypt_stream(
+        self,
+        src: StreamSource,
+        dst: BinaryIO,
+        max_workers: Optional[int] = None,
+        digests: Optional[List[str]] = None
+    ) -> int:
+        """Decrypt a stream written by ``encrypt_stream`` into ``dst``.
+
+        Returns the number of plaintext bytes written. If ``digests`` are
+        given (e.g. from the encryption manifest), every chunk is also
+        checked against its recorded SHA-256 digest.
+        """
+        reader = _as_reader(src)
+        header, chunk_size, cipher = self._read_stream_header(reader)
+
+        def decrypt_chunk(index: int, flags: int, ciphertext: bytes) -> bytes:
+            aad = header + FRAME_AAD.pack(index, flags)
+            try:
+                plaintext = cipher.decrypt(index.to_bytes(12, 'big'), ciphertext, aad)
+            except InvalidTag as e:
+                raise SecurityException(f"Chunk {index} failed authentication") from e
+            if digests is not None and (index >= len(digests) or self.hash_chunk(plaintext) != digests[index]):
+                raise SecurityException(f"Chunk {index} does not match its digest")
+            return plaintext
+
+        total = 0
+        workers = _worker_count(max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            window = 2 * workers
+            pending = deque()
+            index, final = 0, False
+            while not final:
+                frame = _read_frame_header(reader, chunk_size)
+                if frame is None:
+                    raise SecurityException("Encrypted stream is truncated")
+                length, flags = frame
+                final = bool(flags & FRAME_FINAL)
+                pending.append(executor.submit(decrypt_chunk, index, flags, _read_exact(reader, length)))
+                index += 1
+                while pending and (len(pending) >= window or final):
+                    plaintext = pending.popleft().result()
+                    dst.write(plaintext)
+                    total += len(plaintext)
+        if reader.read(1):
+            raise SecurityException("Unexpected data after final chunk")
+        if digests is not None and index != len(digests):
+            raise SecurityException("Chunk count does not match digests")
+        return total
+
+    def decrypt_chunk(self, src: StreamSource, index: int, digest: Optional[str] = None) -> bytes:
+        """Decrypt a single chunk by index without reading the rest of the stream.
+
+        Bytes-like sources are sliced in place rather than copied. If
+        ``digest`` is given, the plaintext is checked against it.
+        """
+        reader = _as_reader(src)
+        reader.seek(0)
+        header, chunk_size, cipher = self._read_stream_header(reader)
+        frame_size = FRAME_HEADER.size + chunk_size + GCM_TAG_SIZE
+        reader.seek(STREAM_HEADER.size + index * frame_size)
+        frame = _read_frame_header(reader, chunk_size) if index >= 0 else None
+        if frame is None:
+            raise IndexError(f"Chunk {index} is out of range")
+        length, flags = frame
+        aad = header + FRAME_AAD.pack(index, flags)
+        try:
+            plaintext = cipher.decrypt(index.to_bytes(12, 'big'), _read_exact(reader, length), aad)
+        except InvalidTag as e:
+            raise SecurityException(f"Chunk {index} failed authentication") from e
+        if digest is not None and self.hash_chunk(plaintext) != digest:
+            raise SecurityException(f"Chunk {index} does not match its digest")
+        return plaintext
     
     def quantum_safe_encrypt(self, data: Union[str, bytes]) -> bytes:
         """Implement quantum-safe encryption"""
@@ -0,0 +1,18 @@
+"""Shared simulation service with micro-batching."""
+from src.service.simulation_service import (
+    SimulationService,
+    SimulationClient,
+    ServiceConfig,
+    ServiceError,
+    EnvironmentBackend,
+    MicroBatcher,
+)
+
+__all__ = [
+    'SimulationService',
+    'SimulationClient',
+    'ServiceConfig',
+    'ServiceError',
+    'EnvironmentBackend',
+    'MicroBatcher',
+]
@@ -0,0 +1,520 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SESSION_OPS = ('reset', 'step')
+BATCHED_OPS = SESSION_OPS + ('execute',)
+
+class ServiceError(Exception):
+    """Raised for malformed or failed simulation requests."""
+    pass
+
+@dataclass
+class ServiceConfig:
+    host: str = '127.0.0.1'
+    port: int = 8765
+    unix_socket: Optional[str] = None
+    max_batch_size: int = 64
+    max_batch_latency: float = 0.002
+    workers: int = 4
+    max_pending: int = 10000
+    session_workers: int = 4
+    export_prometheus: bool = False
+    prometheus_port: int = 9108
+
+@dataclass
+class SimulationRequest:
+    op: str
+    params: Dict[str, Any]
+    owner: Optional[int] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    future: Optional[asyncio.Future] = None
+
+class Histogram:
+    """Fixed-bucket histogram with cumulative counts, as in Prometheus."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = list(itertools.accumulate(self.counts))
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        return {
+            'buckets': dict(zip(bounds, cumulative)),
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+        }
+
+class ServiceMetrics:
+    """Queue-latency and batch-size histograms for the simulation service."""
+
+    def __init__(self, export_prometheus: bool = False):
+        self.queue_latency = Histogram((.0001, .0005, .001, .002, .005, .01, .05, .1, .5, 1.0))
+        self.batch_latency = Histogram((.001, .005, .01, .05, .1, .5, 1.0, 5.0))
+        self.batch_size = Histogram((1, 2, 4, 8, 16, 32, 64, 128, 256))
+        self.requests = 0
+        self.errors = 0
+        self.prometheus = None
+        if export_prometheus:
+            from src.monitoring.metrics import SimulationServiceMetricsCollector
+            self.prometheus = SimulationServiceMetricsCollector()
+
+    def record_batch(self, requests: List[SimulationRequest], dispatched_at: float, elapsed: float) -> None:
+        self.batch_size.observe(len(requests))
+        self.batch_latency.observe(elapsed)
+        for request in requests:
+            self.queue_latency.observe(dispatched_at - request.enqueued_at)
+        self.requests += len(requests)
+        if self.prometheus is not None:
+            self.prometheus.record_batch(
+                [dispatched_at - request.enqueued_at for request in requests], elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'queue_latency_seconds': self.queue_latency.snapshot(),
+            'batch_latency_seconds': self.batch_latency.snapshot(),
+            'batch_size': self.batch_size.snapshot(),
+        }
+
+def _to_jsonable(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        if np.iscomplexobj(value):
+            return {'real': value.real.tolist(), 'imag': value.imag.tolist()}
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    return value
+
+SessionKey = Tuple[Optional[int], str]
+
+class EnvironmentBackend:
+    """Runs batches of requests against per-session environments.
+
+    ``reset`` and ``step`` are routed to the ``QuantumEnvironment`` owned by
+    each session. Within a batch, session requests are grouped by session:
+    each group runs in arrival order on a session worker pool, so different
+    sessions step concurrently. All ``execute`` requests in a batch are sent
+    to the simulator as a single multi-circuit job. Sessions are keyed by
+    the owning connection and the client's session id, so one client cannot
+    reach another's environments.
+    """
+
+    def __init__(self, env_factory: Optional[Callable[..., Any]] = None,
+                 circuit_executor: Optional[Callable[[List[str]], List[Any]]] = None,
+                 session_workers: int = 4):
+        self.env_factory = env_factory or self._default_env_factory
+        self.circuit_executor = circuit_executor or self._default_circuit_executor
+        self.sessions: Dict[SessionKey, Tuple[Any, threading.Lock]] = {}
+        self._sessions_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=session_workers,
+                                           thread_name_prefix='session-worker')
+
+    @staticmethod
+    def _default_env_factory(**config: Any) -> Any:
+        from src.adaptive_error_correction.environment import QuantumEnvironment, EnvironmentConfig
+        return QuantumEnvironment(EnvironmentConfig(**config))
+
+    @staticmethod
+    def _default_circuit_executor(qasm_circuits: List[str]) -> List[Any]:
+        import qiskit
+        circuits = [qiskit.QuantumCircuit.from_qasm_str(qasm) for qasm in qasm_circuits]
+        backend = qiskit.Aer.get_backend('aer_simulator')
+        result = qiskit.execute(circuits, backend).result()
+        return [result.get_counts(i) for i in range(len(circuits))]
+
+    @staticmethod
+    def _session_key(request: SimulationRequest) -> SessionKey:
+        session_id = request.params.get('session')
+        if not isinstance(session_id, str):
+            raise ServiceError("Request needs a string 'session'")
+        return request.owner, session_id
+
+    def _session(self, request: SimulationRequest, create: bool) -> Tuple[Any, threading.Lock]:
+        key = self._session_key(request)
+        with self._sessions_lock:
+            entry = self.sessions.get(key)
+            if entry is None:
+                if not create:
+                    raise ServiceError(f"Unknown session '{key[1]}'; call reset first")
+                entry = (self.env_factory(**request.params.get('config', {})), threading.Lock())
+                self.sessions[key] = entry
+        return entry
+
+    def close_session(self, session_id: str, owner: Optional[int] = None) -> bool:
+        if not isinstance(session_id, str):
+            return False
+        with self._sessions_lock:
+            return self.sessions.pop((owner, session_id), None) is not None
+
+    def close_owner(self, owner: Optional[int]) -> int:
+        """Drop every session owned by a connection; returns how many were closed."""
+        with self._sessions_lock:
+            keys = [key for key in self.sessions if key[0] == owner]
+            for key in keys:
+                del self.sessions[key]
+        return len(keys)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    def _run_session_op(self, request: SimulationRequest) -> Any:
+        env, lock = self._session(request, create=request.op == 'reset')
+        with lock:
+            if request.op == 'reset':
+                return {'state': env.reset()}
+            result = env.step(int(request.params['action']))
+        if hasattr(result, 'state'):
+            return {'state': result.state, 'reward': result.reward,
+                    'done': result.done, 'info': result.info}
+        state, reward, done, info = result
+        return {'state': state, 'reward': reward, 'done': done, 'info': info}
+
+    def _run_session_group(self, requests: List[SimulationRequest]) -> List[Tuple[bool, Any]]:
+        outcomes = []
+        for request in requests:
+            try:
+                outcomes.append((True, self._run_session_op(request)))
+            except Exception as e:
+                outcomes.append((False, str(e)))
+        return outcomes
+
+    def handle_batch(self, requests: List[SimulationRequest]) -> List[Tuple[bool, Any]]:
+        """Process a batch; returns an (ok, result-or-error) pair per request.
+
+        Each session's requests are handed to the session pool as one group,
+        while this thread runs the batch's ``execute`` job.
+        """
+        outcomes: List[Tuple[bool, Any]] = [(False, None)] * len(requests)
+
+        groups: Dict[Tuple[Any, ...], List[int]] = {}
+        for i, request in enumerate(requests):
+            if request.op != 'execute':
+                session_id = request.params.get('session')
+                # Malformed session ids fail on their own in _session_key.
+                key = (request.owner, session_id) if isinstance(session_id, str) else (request.owner, None, i)
+                groups.setdefault(key, []).append(i)
+        pending = [(indices, self.executor.submit(self._run_session_group, [requests[i] for i in indices]))
+                   for indices in groups.values()]
+
+        executes = [i for i, request in enumerate(requests) if request.op == 'execute']
+        if executes:
+            try:
+                results = self.circuit_executor([requests[i].params['qasm'] for i in executes])
+                for i, result in zip(executes, results):
+                    outcomes[i] = (True, {'result': result})
+            except Exception as e:
+                for i in executes:
+                    outcomes[i] = (False, f"Circuit execution failed: {e}")
+
+        for indices, future in pending:
+            for i, outcome in zip(indices, future.result()):
+                outcomes[i] = outcome
+        return [(ok, _to_jsonable(value)) for ok, value in outcomes]
+
+class MicroBatcher:
+    """Coalesces concurrent requests into batches within a latency budget.
+
+    The first request of a batch starts a ``max_latency`` timer; the batch
+    is dispatched when the timer expires or ``max_batch_size`` requests have
+    arrived, whichever comes first. Batches run on a thread pool so the
+    event loop keeps accepting requests while simulations are in flight.
+    """
+
+    def __init__(self, handler: Callable[[List[SimulationRequest]], List[Tuple[bool, Any]]],
+                 config: ServiceConfig, metrics: ServiceMetrics):
+        self.handler = handler
+        self.config = config
+        self.metrics = metrics
+        self.queue: Optional[asyncio.Queue] = None
+        self.executor = ThreadPoolExecutor(max_workers=config.workers,
+                                           thread_name_prefix='simulation-worker')
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    def start(self) -> None:
+        self.queue = asyncio.Queue(maxsize=self.config.max_pending)
+        self._slots = asyncio.Semaphore(self.config.workers)
+        self._task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+
+    async def submit(self, op: str, params: Dict[str, Any], owner: Optional[int] = None) -> Tuple[bool, Any]:
+        request = SimulationRequest(op=op, params=params, owner=owner)
+        request.future = asyncio.get_running_loop().create_future()
+        await self.queue.put(request)
+        return await request.future
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.config.max_batch_latency
+            while len(batch) < self.config.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()
+            # Requests that arrived while waiting for a free worker join this batch.
+            while len(batch) < self.config.max_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            task = loop.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[SimulationRequest]) -> None:
+        loop = asyncio.get_running_loop()
+        dispatched_at = time.perf_counter()
+        try:
+            outcomes = await loop.run_in_executor(self.executor, self.handler, batch)
+        except Exception as e:
+            logger.error(f"Simulation batch of {len(batch)} failed: {e}")
+            outcomes = [(False, str(e))] * len(batch)
+        finally:
+            self._slots.release()
+        self.metrics.record_batch(batch, dispatched_at, time.perf_counter() - dispatched_at)
+        self.metrics.errors += sum(1 for ok, _ in outcomes if not ok)
+        for request, outcome in zip(batch, outcomes):
+            if not request.future.done():
+                request.future.set_result(outcome)
+
+class SimulationService:
+    """JSON-lines simulation server over TCP or a Unix socket.
+
+    Each line is a request ``{"id": ..., "op": ..., ...}``; responses carry
+    the same ``id`` and may arrive out of order, so clients can pipeline
+    many requests on one connection. Supported ops are ``reset``, ``step``
+    and ``execute`` (micro-batched), plus ``close`` and ``metrics``.
+    Sessions belong to the connection that reset them, are invisible to
+    other connections and are closed when it disconnects. With
+    ``export_prometheus`` the metrics are also served for scraping on
+    ``prometheus_port``.
+    """
+
+    def __init__(self, config: Optional[ServiceConfig] = None,
+                 backend: Optional[EnvironmentBackend] = None):
+        self.config = config or ServiceConfig()
+        self.backend = backend or EnvironmentBackend(session_workers=self.config.session_workers)
+        self.metrics = ServiceMetrics(self.config.export_prometheus)
+        self.batcher = MicroBatcher(self.backend.handle_batch, self.config, self.metrics)
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.metrics_server: Any = None
+        self._connection_ids = itertools.count()
+
+    async def start(self) -> None:
+        self.batcher.start()
+        if self.metrics.prometheus is not None:
+            from prometheus_client import start_http_server
+            self.metrics_server, _ = start_http_server(self.config.prometheus_port, addr=self.config.host)
+            self.config.prometheus_port = self.metrics_server.server_port
+            logger.info(f"Serving Prometheus metrics on {self.config.host}:{self.config.prometheus_port}")
+        if self.config.unix_socket:
+            self.server = await asyncio.start_unix_server(self._handle_connection,
+                                                          path=self.config.unix_socket)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection,
+                                                     self.config.host, self.config.port)
+            self.config.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Simulation service listening on {self.address}")
+
+    @property
+    def address(self) -> str:
+        return self.config.unix_socket or f"{self.config.host}:{self.config.port}"
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+        self.backend.close()
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+            self.metrics_server = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def handle_request(self, message: Dict[str, Any], owner: Optional[int] = None) -> Dict[str, Any]:
+        op = message.get('op')
+        if op in BATCHED_OPS:
+            ok, value = await self.batcher.submit(op, message, owner)
+        elif op == 'close':
+            ok, value = True, {'closed': self.backend.close_session(message.get('session'), owner)}
+        elif op == 'metrics':
+            ok, value = True, self.metrics.snapshot()
+        else:
+            ok, value = False, f"Unknown op '{op}'"
+        response = {'id': message.get('id'), 'ok': ok}
+        response['result' if ok else 'error'] = value
+        return response
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        pending = set()
+        connection = next(self._connection_ids)
+
+        async def respond(message: Dict[str, Any]) -> None:
+            response = await self.handle_request(message, connection)
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        async def reject(error: str) -> None:
+            async with write_lock:
+                writer.write(json.dumps({'id': None, 'ok': False, 'error': error}).encode() + b'\n')
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as e:
+                    await reject(f"Invalid JSON: {e}")
+                    continue
+                if not isinstance(message, dict):
+                    await reject("Request must be a JSON object")
+                    continue
+                task = asyncio.get_running_loop().create_task(respond(message))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            self.backend.close_owner(connection)
+            writer.close()
+
+class SimulationClient:
+    """Asyncio client for ``SimulationService`` supporting pipelined requests."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._ids = itertools.count()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_responses())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765,
+                      unix_socket: Optional[str] = None) -> 'SimulationClient':
+        if unix_socket:
+            reader, writer = await asyncio.open_unix_connection(unix_socket)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ServiceError("Connection closed"))
+            self._pending.clear()
+
+    async def request(self, op: str, **params: Any) -> Any:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.writer.write(json.dumps({'id': request_id, 'op': op, **params}).encode() + b'\n')
+        await self.writer.drain()
+        response = await future
+        if not response['ok']:
+            raise ServiceError(response['error'])
+        return response['result']
+
+    async def reset(self, session: str, **config: Any) -> Any:
+        return await self.request('reset', session=session, config=config)
+
+    async def step(self, session: str, action: int) -> Any:
+        return await self.request('step', session=session, action=action)
+
+    async def execute(self, qasm: str) -> Any:
+        return await self.request('execute', qasm=qasm)
+
+    async def close(self) -> None:
+        self.writer.close()
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except asyncio.CancelledError:
+            pass
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Micro-batching quantum simulation service")
+    parser.add_argument('--host', default=ServiceConfig.host)
+    parser.add_argument('--port', type=int, default=ServiceConfig.port)
+    parser.add_argument('--unix-socket')
+    parser.add_argument('--max-batch-size', type=int, default=ServiceConfig.max_batch_size)
+    parser.add_argument('--max-batch-latency', type=float, default=ServiceConfig.max_batch_latency,
+                        help="seconds to wait for a batch to fill")
+    parser.add_argument('--workers', type=int, default=ServiceConfig.workers)
+    parser.add_argument('--export-prometheus', action='store_true')
+    parser.add_argument('--prometheus-port', type=int, default=ServiceConfig.prometheus_port)
+    args = parser.parse_args(argv)
+
+    config = ServiceConfig(
+        host=args.host, port=args.port, unix_socket=args.unix_socket,
+        max_batch_size=args.max_batch_size, max_batch_latency=args.max_batch_latency,
+        workers=args.workers, export_prometheus=args.export_prometheus,
+        prometheus_port=args.prometheus_port
+    )
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(SimulationService(config).serve_forever())
+
+if __name__ == '__main__':
+    main()
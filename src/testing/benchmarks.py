@@ -0,0 +1,356 @@
+import argparse
+import gc
+import itertools
+import json
+import logging
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parents[2] / 'benchmarks' / 'baseline.json'
+DEFAULT_GATE_MIXES = {
+    'clifford': ('h', 'x', 'z', 'cx'),
+    'rotation': ('rx', 'rz', 'cx'),
+    'correction': ('x', 'z', 'h'),
+}
+
+@dataclass(frozen=True)
+class CircuitSpec:
+    num_qubits: int
+    depth: int
+    gate_mix: str = 'clifford'
+
+    @property
+    def key(self) -> str:
+        return f"q{self.num_qubits}-d{self.depth}-{self.gate_mix}"
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    params: str
+    iterations: int = 0
+    mean_time: float = 0.0
+    p50_time: float = 0.0
+    p95_time: float = 0.0
+    ops_per_sec: float = 0.0
+    peak_memory_bytes: int = 0
+    skipped: Optional[str] = None
+    failed: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.params}]"
+
+@dataclass
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.metric} {self.baseline:.4g} -> {self.current:.4g}"
+
+def build_circuit(spec: CircuitSpec, seed: int = 0) -> Any:
+    """Build a random layered circuit with the given width, depth and gate mix."""
+    from qiskit import QuantumCircuit
+
+    rng = np.random.default_rng(seed)
+    gates = DEFAULT_GATE_MIXES[spec.gate_mix]
+    circuit = QuantumCircuit(spec.num_qubits)
+    for _ in range(spec.depth):
+        for qubit in range(spec.num_qubits):
+            gate = gates[rng.integers(len(gates))]
+            if gate == 'cx':
+                if spec.num_qubits > 1:
+                    target = (qubit + 1 + rng.integers(spec.num_qubits - 1)) % spec.num_qubits
+                    circuit.cx(qubit, int(target))
+            elif gate in ('rx', 'rz'):
+                getattr(circuit, gate)(float(rng.uniform(0, 2 * np.pi)), qubit)
+            else:
+                getattr(circuit, gate)(qubit)
+    return circuit
+
+def circuit_corpus(
+    qubit_counts: Sequence[int] = (2, 5, 10),
+    depths: Sequence[int] = (10, 50),
+    gate_mixes: Iterable[str] = ('clifford', 'rotation'),
+    seed: int = 0
+) -> List[Tuple[CircuitSpec, Any]]:
+    """Parameterized corpus of (spec, circuit) pairs covering every combination."""
+    corpus = []
+    for gate_mix in gate_mixes:
+        for num_qubits in qubit_counts:
+            for depth in depths:
+                spec = CircuitSpec(num_qubits, depth, gate_mix)
+                corpus.append((spec, build_circuit(spec, seed)))
+    return corpus
+
+def measure(
+    name: str,
+    params: str,
+    operation: Callable[[], Any],
+    iterations: int = 20,
+    warmup: int = 2
+) -> BenchmarkResult:
+    """Time ``operation`` and record its peak traced memory allocation."""
+    for _ in range(warmup):
+        operation()
+
+    timings = np.empty(iterations)
+    gc.collect()
+    for i in range(iterations):
+        start = time.perf_counter()
+        operation()
+        timings[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    mean = float(timings.mean())
+    return BenchmarkResult(
+        name=name,
+        params=params,
+        iterations=iterations,
+        mean_time=mean,
+        p50_time=float(np.percentile(timings, 50)),
+        p95_time=float(np.percentile(timings, 95)),
+        ops_per_sec=1.0 / mean if mean > 0 else float('inf'),
+        peak_memory_bytes=int(peak)
+    )
+
+BenchmarkCase = Tuple[str, Callable[[], Callable[[], Any]]]
+
+class BenchmarkSuite:
+    """Registry of benchmarks with JSON baselines and regression checks.
+
+    A benchmark is a generator of ``(params, setup)`` pairs; each ``setup``
+    builds its fixtures and returns the zero-argument operation to time.
+    Benchmarks whose dependencies are missing (``ImportError``) are reported
+    as skipped; any other error in setup or in the timed operation is
+    reported as failed.
+    """
+
+    def __init__(self, iterations: int = 20, warmup: int = 2):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.benchmarks: Dict[str, Callable[[], Iterable[BenchmarkCase]]] = {}
+
+    def register(self, name: str) -> Callable:
+        def decorator(cases: Callable[[], Iterable[BenchmarkCase]]) -> Callable:
+            self.benchmarks[name] = cases
+            return cases
+        return decorator
+
+    def run(self, names: Optional[Iterable[str]] = None) -> List[BenchmarkResult]:
+        results = []
+        for name in names or self.benchmarks:
+            try:
+                cases = list(self.benchmarks[name]())
+            except ImportError as e:
+                logger.warning(f"Skipping benchmark {name}: {e}")
+                results.append(BenchmarkResult(name=name, params='*', skipped=str(e)))
+                continue
+            for params, setup in cases:
+                try:
+                    operation = setup()
+                except ImportError as e:
+                    logger.warning(f"Skipping benchmark {name}[{params}]: {e}")
+                    results.append(BenchmarkResult(name=name, params=params, skipped=str(e)))
+                    continue
+                except Exception as e:
+                    logger.error(f"Benchmark {name}[{params}] failed during setup: {e}")
+                    results.append(BenchmarkResult(name=name, params=params, failed=str(e)))
+                    continue
+                try:
+                    results.append(measure(name, params, operation, self.iterations, self.warmup))
+                except Exception as e:
+                    logger.error(f"Benchmark {name}[{params}] failed: {e}")
+                    results.append(BenchmarkResult(name=name, params=params, failed=str(e)))
+        return results
+
+    @staticmethod
+    def save_baseline(results: List[BenchmarkResult], path: Path = DEFAULT_BASELINE_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'machine': {'python': platform.python_version(), 'platform': platform.platform()},
+            'results': {r.key: asdict(r) for r in results if r.skipped is None and r.failed is None},
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def load_baseline(path: Path = DEFAULT_BASELINE_PATH) -> Dict[str, BenchmarkResult]:
+        with open(path) as f:
+            payload = json.load(f)
+        return {key: BenchmarkResult(**value) for key, value in payload['results'].items()}
+
+    @staticmethod
+    def compare(
+        baseline: Dict[str, BenchmarkResult],
+        results: List[BenchmarkResult],
+        throughput_tolerance: float = 0.2,
+        memory_tolerance: float = 0.25,
+        memory_floor_bytes: int = 64 * 1024
+    ) -> List[Regression]:
+        """Regressions where throughput dropped or peak memory grew beyond tolerance.
+
+        Memory growth smaller than ``memory_floor_bytes`` is ignored so that
+        allocator noise on tiny benchmarks does not trip the check. A
+        baseline case that failed, or that is missing from a benchmark that
+        ran, is a regression too; only cases skipped for a missing
+        dependency are exempt.
+        """
+        regressions = []
+        ran = {result.name for result in results if not (result.params == '*' and result.skipped)}
+        measured = {result.key for result in results}
+        for key, reference in baseline.items():
+            if reference.name in ran and key not in measured:
+                regressions.append(Regression(key, 'missing', reference.ops_per_sec, 0.0))
+        for result in results:
+            reference = baseline.get(result.key)
+            if result.skipped is not None or reference is None:
+                continue
+            if result.failed is not None:
+                regressions.append(Regression(result.key, 'failed', reference.ops_per_sec, 0.0))
+                continue
+            if result.ops_per_sec < reference.ops_per_sec * (1 - throughput_tolerance):
+                regressions.append(Regression(result.key, 'ops_per_sec',
+                                              reference.ops_per_sec, result.ops_per_sec))
+            memory_growth = result.peak_memory_bytes - reference.peak_memory_bytes
+            if (memory_growth > memory_floor_bytes
+                    and result.peak_memory_bytes > reference.peak_memory_bytes * (1 + memory_tolerance)):
+                regressions.append(Regression(result.key, 'peak_memory_bytes',
+                                              reference.peak_memory_bytes, result.peak_memory_bytes))
+        return regressions
+
+def default_suite(
+    qubit_counts: Sequence[int] = (2, 5, 10),
+    depths: Sequence[int] = (10, 50),
+    iterations: int = 20
+) -> BenchmarkSuite:
+    """Benchmarks for the environment, optimizer, validator and agent hot paths."""
+    suite = BenchmarkSuite(iterations=iterations)
+
+    @suite.register('environment.reset')
+    def environment_reset():
+        for num_qubits in qubit_counts:
+            def setup(num_qubits=num_qubits):
+                from src.adaptive_error_correction.environment import QuantumEnvironment, EnvironmentConfig
+                env = QuantumEnvironment(EnvironmentConfig(num_qubits=num_qubits))
+                return env.reset
+            yield f"q{num_qubits}", setup
+
+    @suite.register('environment.step')
+    def environment_step():
+        for num_qubits in qubit_counts:
+            def setup(num_qubits=num_qubits):
+                from src.adaptive_error_correction.environment import QuantumEnvironment, EnvironmentConfig
+                env = QuantumEnvironment(EnvironmentConfig(num_qubits=num_qubits))
+                env.reset()
+                actions = itertools.cycle(int(a) for a in np.random.default_rng(0).integers(env.action_size, size=1024))
+                return lambda: env.step(next(actions))
+            yield f"q{num_qubits}", setup
+
+    @suite.register('environment.step_sequence')
+    def environment_step_sequence():
+        for num_qubits in qubit_counts:
+            def setup(num_qubits=num_qubits):
+                from src.adaptive_error_correction.environment import QuantumEnvironment, EnvironmentConfig
+                env = QuantumEnvironment(EnvironmentConfig(num_qubits=num_qubits))
+                env.reset()
+                actions = [int(a) for a in np.random.default_rng(0).integers(env.action_size, size=100)]
+                return lambda: env.step_sequence(actions)
+            yield f"q{num_qubits}-a100", setup
+
+    @suite.register('circuit_optimizer.optimize')
+    def optimizer_optimize():
+        from src.adaptive_error_correction.circuit_optimizer import CircuitOptimizer
+        for spec, circuit in circuit_corpus(qubit_counts, depths):
+            def setup(circuit=circuit):
+                optimizer = CircuitOptimizer()
+                # Bypass the result caches so every iteration does the work.
+                return lambda: optimizer.pass_manager.run(circuit)
+            yield spec.key, setup
+
+    @suite.register('circuit_validator.validate_circuit')
+    def validator_validate():
+        from src.validation.circuit_validator import CircuitValidator
+        validator = CircuitValidator()
+        for spec, circuit in circuit_corpus(qubit_counts, depths):
+            yield spec.key, lambda circuit=circuit: (lambda: validator.validate_circuit(circuit))
+
+    @suite.register('error_correction_agent.get_action')
+    def agent_get_action():
+        for num_qubits in qubit_counts:
+            def setup(num_qubits=num_qubits):
+                from src.error_correction.agent import ErrorCorrectionAgent
+                state_dim = 2 ** num_qubits
+                agent = ErrorCorrectionAgent(state_dim=state_dim, action_dim=4)
+                state = np.random.default_rng(0).random(state_dim)
+                return lambda: agent.get_action(state)
+            yield f"q{num_qubits}", setup
+
+    @suite.register('error_correction_agent.train')
+    def agent_train():
+        for batch_size in (32, 256, 2048):
+            def setup(batch_size=batch_size):
+                from src.error_correction.agent import ErrorCorrectionAgent
+                from src.error_correction.trainer import TrainerConfig
+                agent = ErrorCorrectionAgent(state_dim=4, action_dim=4,
+                                             trainer_config=TrainerConfig(batch_size=batch_size))
+                rng = np.random.default_rng(0)
+                states = rng.random((batch_size * 8, 4), dtype=np.float32)
+                actions = rng.integers(4, size=len(states))
+                advantages = rng.standard_normal(len(states)).astype(np.float32)
+                return lambda: agent.train(states, actions, advantages)
+            yield f"b{batch_size}", setup
+
+    return suite
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run performance benchmarks")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="record the results as the new baseline")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--benchmark', action='append', dest='names',
+                        help="run only the named benchmark (repeatable)")
+    args = parser.parse_args(argv)
+
+    suite = default_suite(iterations=args.iterations)
+    results = suite.run(args.names)
+    for result in results:
+        if result.failed:
+            print(f"{result.key:60s} FAILED: {result.failed}")
+        elif result.skipped:
+            print(f"{result.key:60s} skipped: {result.skipped}")
+        else:
+            print(f"{result.key:60s} {result.ops_per_sec:12.1f} ops/s "
+                  f"{result.peak_memory_bytes / 1024:10.1f} KiB")
+
+    if args.save_baseline:
+        suite.save_baseline(results, args.baseline)
+        return 0
+    if args.baseline.exists():
+        regressions = suite.compare(suite.load_baseline(args.baseline), results,
+                                    throughput_tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
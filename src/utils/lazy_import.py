@@ -0,0 +1,51 @@
+import importlib
+import sys
+from types import ModuleType
+from typing import Any, List
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    Heavy backends such as qiskit, Aer or TensorFlow take seconds to import,
+    so modules that merely reference them bind a ``LazyModule`` at import time
+    and pay for the real import the first time the backend is actually used.
+    """
+
+    __slots__ = ('_name', '_module')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the underlying module has been imported yet."""
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> Any:
+    """Return ``name`` as a module, deferring the import until first use.
+
+    If the module has already been imported elsewhere the real module object
+    is returned directly, so there is no proxy overhead in warm processes.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
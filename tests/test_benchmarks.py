@@ -0,0 +1,59 @@
+import numpy as np
+from src.testing.benchmarks import BenchmarkResult, BenchmarkSuite, measure
+
+def result(params, ops_per_sec=100.0, peak=1024 * 1024, **kwargs):
+    return BenchmarkResult(name='bench', params=params, ops_per_sec=ops_per_sec,
+                           peak_memory_bytes=peak, **kwargs)
+
+def test_measure_counts_iterations_and_memory():
+    calls = []
+
+    def operation():
+        calls.append(np.ones(100_000))
+
+    measured = measure('alloc', 'n100k', operation, iterations=5, warmup=2)
+    assert len(calls) == 2 + 5 + 1
+    assert measured.iterations == 5
+    assert measured.p50_time <= measured.p95_time
+    assert measured.ops_per_sec > 0
+    assert measured.peak_memory_bytes >= 800_000
+
+def test_compare_flags_slowdown_and_memory_growth():
+    baseline = {r.key: r for r in (result('a'), result('b'))}
+    regressions = BenchmarkSuite.compare(baseline, [result('a', ops_per_sec=50.0),
+                                                    result('b', peak=4 * 1024 * 1024)])
+    assert sorted((r.key, r.metric) for r in regressions) == [
+        ('bench[a]', 'ops_per_sec'), ('bench[b]', 'peak_memory_bytes')]
+
+def test_compare_flags_failed_and_missing_cases():
+    baseline = {r.key: r for r in (result('a'), result('b'), result('c'))}
+    regressions = BenchmarkSuite.compare(baseline, [result('a', failed='boom'), result('c')])
+    assert sorted((r.key, r.metric) for r in regressions) == [('bench[a]', 'failed'), ('bench[b]', 'missing')]
+
+def test_compare_allows_missing_dependencies():
+    baseline = {r.key: r for r in (result('a'), result('b'))}
+    assert BenchmarkSuite.compare(baseline, [result('a', skipped='no qiskit'), result('b')]) == []
+    assert BenchmarkSuite.compare(baseline, [result('*', skipped='no qiskit')]) == []
+
+def test_run_reports_setup_errors_as_failed():
+    suite = BenchmarkSuite(iterations=1, warmup=0)
+
+    @suite.register('bench')
+    def cases():
+        yield 'ok', lambda: (lambda: None)
+        yield 'missing', lambda: __import__('not_a_real_module')
+        yield 'broken', lambda: 1 / 0
+        yield 'crashes', lambda: (lambda: 1 / 0)
+
+    results = {r.params: r for r in suite.run()}
+    assert results['ok'].failed is None and results['ok'].iterations == 1
+    assert results['missing'].skipped and results['missing'].failed is None
+    assert results['broken'].failed and results['broken'].skipped is None
+    assert 'division' in results['crashes'].failed
+
+def test_baseline_round_trip(tmp_path):
+    path = tmp_path / "baseline.json"
+    results = [result('a', mean_time=0.01, iterations=3), result('b', skipped='no qiskit'),
+               result('c', failed='boom')]
+    BenchmarkSuite.save_baseline(results, path)
+    assert BenchmarkSuite.load_baseline(path) == {'bench[a]': results[0]}
@@ -0,0 +1,92 @@
+import os
+import numpy as np
+import pytest
+from utils.data_ingestion import (build_columnar_cache, iter_chunks, load_columns,
+                                  prefetch, stream_dataset)
+
+def write_csv(path, rows):
+    path.write_text("a,b\n" + "".join(f"{a},{b}\n" for a, b in rows))
+    return path
+
+@pytest.mark.parametrize("rows,chunk_size", [(10, 4), (8, 4), (3, 5)])
+def test_npy_chunk_boundaries(tmp_path, rows, chunk_size):
+    data = np.arange(rows * 2, dtype=np.float32).reshape(rows, 2)
+    np.save(tmp_path / "data.npy", data)
+    chunks = list(iter_chunks(str(tmp_path / "data.npy"), chunk_size))
+    assert [len(c) for c in chunks] == [min(chunk_size, rows - s) for s in range(0, rows, chunk_size)]
+    np.testing.assert_array_equal(np.concatenate(chunks), data)
+
+def test_csv_chunk_boundaries(tmp_path):
+    path = write_csv(tmp_path / "data.csv", [(i, i * 0.5) for i in range(10)])
+    chunks = list(iter_chunks(str(path), 4))
+    assert [len(c['a']) for c in chunks] == [4, 4, 2]
+    np.testing.assert_array_equal(np.concatenate([c['b'] for c in chunks]), np.arange(10) * 0.5)
+
+def test_parquet_chunk_boundaries(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.table({'a': np.arange(10), 'b': np.arange(10) * 0.5}), path)
+    chunks = list(iter_chunks(str(path), 4))
+    assert [len(c['a']) for c in chunks] == [4, 4, 2]
+    np.testing.assert_array_equal(np.concatenate([c['a'] for c in chunks]), np.arange(10))
+
+def test_cache_reused_until_source_changes(tmp_path):
+    path = write_csv(tmp_path / "data.csv", [(i, i) for i in range(6)])
+    first = build_columnar_cache(str(path), tmp_path / "cache", chunk_size=4)
+    assert build_columnar_cache(str(path), tmp_path / "cache", chunk_size=4) == first
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = build_columnar_cache(str(path), tmp_path / "cache", chunk_size=4)
+    assert second != first
+    np.testing.assert_array_equal(load_columns(str(path), tmp_path / "cache")['a'], np.arange(6))
+
+def test_csv_dtype_drift_across_chunks(tmp_path):
+    path = write_csv(tmp_path / "data.csv", [(1, 0), (2, 0), ("", 0), (2.5, 0)])
+    columns = load_columns(str(path), tmp_path / "cache", chunk_size=2)
+    np.testing.assert_array_equal(columns['a'], [1.0, 2.0, np.nan, 2.5])
+
+def test_cache_promotes_rows_already_written(tmp_path, monkeypatch):
+    chunks = [{'a': np.array([1, 2], dtype=np.int32)}, {'a': np.array([2.5])}]
+    monkeypatch.setattr("utils.data_ingestion.iter_chunks", lambda *args: iter(chunks))
+    path = write_csv(tmp_path / "data.csv", [])
+    columns = load_columns(str(path), tmp_path / "cache")
+    assert columns['a'].dtype == np.float64
+    np.testing.assert_array_equal(columns['a'], [1.0, 2.0, 2.5])
+
+def test_large_integer_ids_stay_exact(tmp_path):
+    ids = 2 ** 60 + np.arange(10, dtype=np.int64)
+    path = write_csv(tmp_path / "data.csv", [(i, 0) for i in ids.tolist()])
+    columns = load_columns(str(path), tmp_path / "cache", chunk_size=4)
+    assert columns['a'].dtype == np.int64
+    np.testing.assert_array_equal(columns['a'], ids)
+
+def test_prefetch_reads_memmap_chunks_into_memory(tmp_path):
+    np.save(tmp_path / "data.npy", np.arange(10.0))
+    chunks = list(stream_dataset(str(tmp_path / "data.npy"), chunk_size=4))
+    assert not any(isinstance(c, np.memmap) for c in chunks)
+    np.testing.assert_array_equal(np.concatenate(chunks), np.arange(10.0))
+
+def test_prefetch_reraises_producer_error():
+    def chunks():
+        yield 1
+        raise ValueError("bad chunk")
+
+    stream = prefetch(chunks())
+    assert next(stream) == 1
+    with pytest.raises(ValueError, match="bad chunk"):
+        next(stream)
+
+def test_prefetch_stops_producer_on_close():
+    produced = []
+
+    def chunks():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    stream = prefetch(chunks(), depth=2)
+    assert next(stream) == 0
+    stream.close()
+    assert len(produced) < 10
@@ -1,6 +1,9 @@
 import pytest
 import numpy as np
-from src.adaptive_error_correction.environment import QuantumEnvironment, EnvironmentConfig
+from src.adaptive_error_correction.environment import QuantumEnvironment, EnvironmentConfig, InvalidActionError
+from src.adaptive_error_correction.statevector import StatevectorSimulator, GATES, TWO_QUBIT_GATES, fuse
+from src.adaptive_error_correction.mps import MPSSimulator
+from src.adaptive_error_correction.backends import choose_simulation_method, SimulationMethodError
 
 @pytest.fixture
 def env():
@@ -29,3 +32,135 @@ def test_invalid_action(env):
     env.reset()
     with pytest.raises(ValueError):
         env.step(10)  # Invalid action
+
+def test_snapshot_restore_replays_noise():
+    env = QuantumEnvironment(EnvironmentConfig(num_qubits=3, noise_level=0.5, seed=7))
+    env.reset()
+    env.step(1)
+    snapshot = env.snapshot()
+    first = [env.step(a) for a in (0, 3, 5)]
+    env.restore(snapshot)
+    second = [env.step(a) for a in (0, 3, 5)]
+    assert [r.info for r in first] == [r.info for r in second]
+    assert np.array_equal(first[-1].state, second[-1].state)
+
+def test_mps_restore_skips_canonicalization(monkeypatch):
+    env = QuantumEnvironment(EnvironmentConfig(num_qubits=30, noise_level=0.2, seed=3))
+    env.reset()
+    for action in (0, 3, 5):
+        env.step(action)
+    snapshot = env.snapshot()
+    expected = env.step(2).state
+    monkeypatch.setattr(MPSSimulator, '_canonicalize', lambda self: pytest.fail("restore re-canonicalized"))
+    env.restore(snapshot)
+    np.testing.assert_allclose(env.step(2).state, expected, atol=1e-12)
+
+@pytest.mark.parametrize("action", [1.5, "1", True, None])
+def test_non_integer_action_rejected(env, action):
+    env.reset()
+    with pytest.raises(InvalidActionError):
+        env.step(action)
+
+def test_noise_is_depolarizing_channel():
+    env = QuantumEnvironment(EnvironmentConfig(num_qubits=2, noise_level=1.0, seed=5))
+    env.reset()
+    errors = [env.step(0).info['error'] for _ in range(4000)]
+    # Full depolarizing strength still leaves the identity a quarter of the time.
+    assert sum(error is None for error in errors) / len(errors) == pytest.approx(0.25, abs=0.03)
+    assert set(errors) == {None, 'x', 'y', 'z'}
+
+def test_noisy_reset_prepares_bell_state_with_error():
+    env = QuantumEnvironment(EnvironmentConfig(num_qubits=2, noise_level=1.0, seed=2))
+    fidelities = set()
+    for _ in range(50):
+        env.reset()
+        fidelities.add(round(env._calculate_fidelity(), 6))
+    # Z or Y after the Hadamard gives an orthogonal Bell state, I or X the target.
+    assert fidelities == {0.0, 1.0}
+
+def test_noise_model_matches_sampled_noise(env):
+    pytest.importorskip("qiskit.providers.aer")
+    assert set(env.noise_model.noise_instructions) == {'x', 'z', 'h'}
+
+def test_fork_shares_state_until_step(env):
+    env.reset()
+    branches = env.fork(3)
+    assert all(branch.simulator.state is env.simulator.state for branch in branches)
+    branches[0].step(0)
+    assert branches[0].simulator.state is not env.simulator.state
+    assert branches[1].simulator.state is env.simulator.state
+    assert env.steps == 0
+
+def test_fused_sequence_matches_gate_by_gate():
+    operations = [('h', 0), ('x', 1), ('z', 0), ('cx', (0, 2)), ('h', 2), ('y', 1), ('cz', (1, 2)), ('x', 0)]
+    reference, fused = StatevectorSimulator(3), StatevectorSimulator(3)
+    for gate, qubits in operations:
+        if gate in GATES:
+            reference.apply(gate, qubits)
+        else:
+            reference.apply_matrix(TWO_QUBIT_GATES[gate], qubits)
+    fused.apply_sequence(operations)
+    np.testing.assert_allclose(fused.state, reference.state, atol=1e-12)
+    assert fused.passes < reference.passes
+
+def test_fusion_reuses_cached_unitaries():
+    first = fuse([('x', 0), ('h', 0), ('z', 1)])
+    second = fuse([('x', 0), ('h', 0), ('z', 1)])
+    assert len(first) == 1
+    assert first[0][0] is second[0][0]
+
+def test_step_sequence_matches_individual_steps():
+    config = EnvironmentConfig(num_qubits=3, noise_level=0.3, seed=11)
+    actions = [0, 3, 5, 1, 2, 4, 0, 0, 3]
+    stepped, batched = QuantumEnvironment(config), QuantumEnvironment(config)
+    for action in actions:
+        expected = stepped.step(action)
+    result = batched.step_sequence(actions)
+    np.testing.assert_allclose(result.state, expected.state, atol=1e-12)
+    assert result.info['steps'] == expected.info['steps']
+
+def random_operations(num_qubits, count, seed):
+    rng = np.random.default_rng(seed)
+    operations = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            a, b = rng.choice(num_qubits, 2, replace=False)
+            operations.append(('cx', (int(a), int(b))))
+        else:
+            operations.append((('x', 'y', 'z', 'h')[rng.integers(4)], int(rng.integers(num_qubits))))
+    return operations
+
+def test_mps_matches_statevector_without_truncation():
+    operations = random_operations(6, 80, seed=0)
+    dense, mps = StatevectorSimulator(6), MPSSimulator(6)
+    dense.apply_sequence(operations)
+    mps.apply_sequence(operations)
+    np.testing.assert_allclose(mps.to_statevector(), dense.state, atol=1e-10)
+    assert mps.truncation_error < 1e-12
+
+def test_mps_reports_truncation_error_when_capped():
+    operations = random_operations(6, 80, seed=0)
+    dense, mps = StatevectorSimulator(6), MPSSimulator(6, max_bond_dimension=2)
+    dense.apply_sequence(operations)
+    mps.apply_sequence(operations)
+    assert max(mps.bond_dimensions) <= 2
+    assert mps.truncation_error > 0.0
+    assert mps.fidelity(MPSSimulator(6)) >= 0.0
+    assert abs(np.vdot(dense.state, mps.to_statevector())) ** 2 < 1.0
+
+def test_simulation_method_chooser():
+    assert choose_simulation_method(10) == 'statevector'
+    assert choose_simulation_method(40, gates={'h', 'cx'}) == 'stabilizer'
+    assert choose_simulation_method(40, gates={'rx', 'cx'}) == 'matrix_product_state'
+    with pytest.raises(SimulationMethodError):
+        choose_simulation_method(60, gates={'rx'}, memory_budget_mb=1, max_bond_dimension=1024)
+
+def test_large_environment_uses_mps():
+    env = QuantumEnvironment(EnvironmentConfig(num_qubits=40, noise_level=0.1, seed=0))
+    assert env.simulation_method == 'matrix_product_state'
+    assert env.backend_options['method'] == 'matrix_product_state'
+    state = env.reset()
+    assert state.shape == (env.state_size,)
+    result = env.step(0)
+    assert result.info['truncation_error'] == 0.0
+    assert 0.0 <= result.reward <= 1.0 + 1e-9
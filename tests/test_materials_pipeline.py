@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from src.materials_discovery import ScreeningPipeline, ScreeningConfig, ScreeningError, CandidateHasher, HashFilter, TopKBuffer
+
+WEIGHTS = np.random.default_rng(0).standard_normal((20, 50)).astype(np.float32)
+
+def generator(latents):
+    return 1.0 / (1.0 + np.exp(-latents @ WEIGHTS))
+
+def mean_score(candidates):
+    return candidates.mean(axis=1)
+
+def test_hasher_matches_equal_rows():
+    hasher = CandidateHasher(dim=3, decimals=2)
+    rows = np.array([[0.1, 0.2, 0.3], [0.1, 0.2, 0.3001], [0.3, 0.2, 0.1]], dtype=np.float32)
+    hashes = hasher(rows)
+    assert hashes[0] == hashes[1]
+    assert hashes[0] != hashes[2]
+
+def test_top_k_buffer_keeps_best_unique():
+    buffer = TopKBuffer(k=3, dim=1)
+    for batch in (np.array([1., 5., 3.]), np.array([4., 5., 0.])):
+        buffer.push(batch[:, None], batch.astype(np.float32), batch.astype(np.uint64))
+    _, scores = buffer.results()
+    assert scores.tolist() == [5., 4., 3.]
+
+def test_pipeline_returns_sorted_top_k():
+    pipeline = ScreeningPipeline(generator, mean_score, ScreeningConfig(top_k=10, batch_size=1000, seed=1))
+    candidates, scores = pipeline.run(5000)
+    assert candidates.shape == (10, 50)
+    assert np.all(np.diff(scores) <= 0)
+    assert pipeline.stats['generated'] == 5000
+    np.testing.assert_allclose(scores, mean_score(candidates), rtol=1e-5)
+
+def test_pipeline_deduplicates_candidates():
+    def coarse(latents):
+        return np.tile(np.round(latents[:, :1]), (1, 4))
+
+    pipeline = ScreeningPipeline(coarse, mean_score, ScreeningConfig(top_k=20, batch_size=500, seed=0))
+    _, scores = pipeline.run(2000)
+    assert len(np.unique(scores)) == len(scores)
+
+def test_survivors_written_in_chunks(tmp_path):
+    config = ScreeningConfig(top_k=5, batch_size=1000, chunk_size=700,
+                             min_score=0.5, output_dir=str(tmp_path), seed=2)
+    pipeline = ScreeningPipeline(generator, mean_score, config)
+    pipeline.run(3000)
+    chunks = sorted(tmp_path.glob("candidates_*.npz"))
+    rows = sum(len(np.load(chunk)['scores']) for chunk in chunks)
+    assert rows == pipeline.get_statistics()['rows_written']
+    assert all(np.load(chunk)['scores'].min() >= 0.5 for chunk in chunks)
+
+def test_hash_filter_remembers_added_hashes():
+    hashes = np.random.default_rng(0).integers(0, 2 ** 63, size=1000, dtype=np.uint64)
+    seen = HashFilter(capacity=1000, error_rate=1e-3)
+    seen.add(hashes[:500])
+    assert seen.contains(hashes[:500]).all()
+    assert seen.contains(hashes[500:]).mean() < 0.01
+
+def test_written_candidates_unique_across_batches(tmp_path):
+    def coarse(latents):
+        return np.tile(np.round(latents[:, :1]), (1, 4))
+
+    config = ScreeningConfig(top_k=5, batch_size=200, min_score=-10.0, output_dir=str(tmp_path), seed=0)
+    ScreeningPipeline(coarse, mean_score, config).run(2000)
+    rows = np.concatenate([np.load(chunk)['candidates'] for chunk in tmp_path.glob("candidates_*.npz")])
+    assert len(np.unique(rows, axis=0)) == len(rows)
+
+def test_output_requires_min_score(tmp_path):
+    with pytest.raises(ScreeningError):
+        ScreeningPipeline(generator, mean_score, ScreeningConfig(output_dir=str(tmp_path)))
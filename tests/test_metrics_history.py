@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from src.monitoring.history import MetricsHistory, HistoryConfig
+from src.monitoring.error_tracker import ErrorTracker
+
+NOW = 1_699_999_200.0  # hour aligned
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def history(tmp_path, clock):
+    store = MetricsHistory(str(tmp_path), clock=clock)
+    yield store
+    store.close()
+
+def test_rollups_match_raw_samples(history):
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(NOW - 86400, NOW, 5.0)
+    values = rng.lognormal(0.0, 1.0, len(timestamps))
+    history.record_many('execution_time', values, timestamps)
+
+    hours = history.query('execution_time', NOW - 86400, NOW, level='hour')
+    assert len(hours['timestamp']) == 24
+    assert hours['count'].sum() == len(values)
+    np.testing.assert_allclose(hours['min'].min(), values.min())
+    np.testing.assert_allclose((hours['mean'] * hours['count']).sum(), values.sum())
+
+    summary = history.summary('execution_time', NOW - 86400, NOW)
+    assert summary['count'] == len(values)
+    assert summary['p50'] == pytest.approx(np.median(values), rel=0.2)
+    assert summary['p99'] == pytest.approx(np.percentile(values, 99), rel=0.2)
+
+def test_query_picks_level_from_span(history):
+    history.record_many('depth', [1.0, 2.0, 3.0], [NOW - 120, NOW - 60, NOW - 1])
+    assert history.choose_level(NOW - 600, NOW) == 'raw'
+    assert history.choose_level(NOW - 86400, NOW) == 'minute'
+    assert history.choose_level(NOW - 20 * 86400, NOW) == 'hour'
+    raw = history.query('depth', NOW - 600, NOW)
+    assert raw['value'].tolist() == [1.0, 2.0, 3.0]
+    assert history.query('depth', NOW - 86400, NOW)['count'].tolist() == [1, 2]
+
+def test_history_survives_restart_and_merges_buckets(tmp_path, clock):
+    first = MetricsHistory(str(tmp_path), clock=clock)
+    first.record("execution_time", 1.0, NOW - 15)
+    first.close()
+    second = MetricsHistory(str(tmp_path), clock=clock)
+    second.record("execution_time", 3.0, NOW - 5)
+    minutes = second.query('execution_time', NOW - 3600, NOW, level='minute')
+    second.close()
+    assert minutes['count'].tolist() == [2]
+    assert minutes['mean'].tolist() == [2.0]
+    assert minutes['max'].tolist() == [3.0]
+
+def test_expire_applies_per_level_retention(history, clock):
+    history.record('execution_time', 1.0, NOW - 10 * 86400)
+    history.record('execution_time', 1.0, NOW - 40 * 86400)
+    history.record('execution_time', 2.0, NOW)
+    history.flush()
+    history.expire()
+    assert len(history.query('execution_time', NOW - 2 * 86400, NOW + 1, level='raw')['value']) == 1
+    hours = history.query('execution_time', NOW - 60 * 86400, NOW + 1, level='hour')
+    assert hours['count'].sum() == 2
+    assert len(history.query('execution_time', NOW - 60 * 86400, NOW + 1, level='minute')['count']) == 1
+
+def test_retention_read_from_config(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("quantum_environment:\n  monitoring:\n    metrics_retention_days: 14\n")
+    assert HistoryConfig.from_yaml(str(config_file)).retention_days == 14
+
+def test_error_tracker_records_history(history, clock):
+    tracker = ErrorTracker(history=history)
+    for error_type in ('timeout', 'timeout', 'decoherence'):
+        tracker.record_error(error_type, "failed")
+    clock.now = max(event.timestamp for event in tracker.errors) + 1
+    assert tracker.get_error_history(clock.now - 600)['value'].size == 3
+    assert tracker.get_error_history(clock.now - 600, error_type='timeout')['value'].size == 2
+
+def test_new_raw_period_expires_old_segments(history):
+    history.record('execution_time', 1.0, NOW - 2 * 86400)
+    history.record('execution_time', 1.0, NOW)
+    assert history.raw.periods() == [int(NOW // 3600)]
+
+def test_sketch_counts_do_not_saturate(history):
+    timestamps = NOW + np.arange(130_000) * 1e-3
+    history.record_many('latency', np.repeat([1.0, 100.0], [100_000, 30_000]), timestamps)
+    summary = history.summary('latency', NOW, NOW + 300, quantiles=(0.75, 0.9))
+    assert summary['count'] == 130_000
+    # 100k of 130k samples are 1.0; saturated counts would put p75 at 100.
+    assert summary['p75'] == pytest.approx(1.0, rel=0.2)
+    assert summary['p90'] == pytest.approx(100.0, rel=0.2)
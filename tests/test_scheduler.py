@@ -0,0 +1,114 @@
+import queue
+import threading
+import pytest
+from src.hybrid_control import HybridScheduler, SchedulerConfig, SchedulerClosedError, QUANTUM, CLASSICAL
+
+def tag(resource):
+    def executor(batch):
+        return [(resource, task.payload) for task in batch]
+    return executor
+
+@pytest.fixture
+def config():
+    return SchedulerConfig.from_yaml(batch_timeout=0.001)
+
+def test_config_defaults_from_yaml(config):
+    assert config.complexity_threshold == 0.7
+    assert config.noise_threshold == 0.1
+    assert config.quantum_volume_min == 32
+
+def test_all_tasks_complete(config):
+    with HybridScheduler(tag(QUANTUM), tag(CLASSICAL), config) as scheduler:
+        futures = scheduler.submit_many((i / 100, i) for i in range(100))
+        results = [future.result(timeout=5) for future in futures]
+    assert [payload for _, payload in results] == list(range(100))
+    metrics = scheduler.get_metrics()
+    assert metrics[QUANTUM]['completed'] + metrics[CLASSICAL]['completed'] == 100
+
+def test_noisy_system_routes_to_classical(config):
+    with HybridScheduler(tag(QUANTUM), tag(CLASSICAL), config) as scheduler:
+        scheduler.update_noise(0.5)
+        results = [scheduler.submit(0.9, i).result(timeout=5) for i in range(10)]
+    assert all(resource == CLASSICAL for resource, _ in results)
+
+def test_low_complexity_routes_to_classical(config):
+    with HybridScheduler(tag(QUANTUM), tag(CLASSICAL), config) as scheduler:
+        assert scheduler.choose_resource(0.1) == CLASSICAL
+
+def test_full_queue_applies_backpressure():
+    release = threading.Event()
+
+    def blocked(batch):
+        release.wait()
+        return [None] * len(batch)
+
+    config = SchedulerConfig(quantum_workers=0, classical_workers=1,
+                             max_queue_size=1, batch_size=1)
+    scheduler = HybridScheduler(blocked, blocked, config)
+    scheduler.submit(0.1)
+    scheduler.submit(0.1, timeout=1)
+    with pytest.raises(queue.Full):
+        scheduler.submit(0.1, timeout=0.05)
+    release.set()
+    scheduler.shutdown()
+    with pytest.raises(SchedulerClosedError):
+        scheduler.submit(0.1)
+
+def test_executor_failure_propagates(config):
+    def failing(batch):
+        raise RuntimeError("simulator crashed")
+
+    with HybridScheduler(failing, failing, config) as scheduler:
+        future = scheduler.submit(0.5)
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+    assert scheduler.get_metrics()[CLASSICAL]['failed'] == 1
+
+def test_eligibility_requires_volume_above_complexity(config):
+    scheduler = HybridScheduler(tag(QUANTUM), tag(CLASSICAL), config, available_quantum_volume=32)
+    assert scheduler.quantum_eligible(0.9)
+    assert not scheduler.quantum_eligible(100)
+
+def test_failed_batches_do_not_update_cost_model(config):
+    def failing(batch):
+        raise RuntimeError("simulator crashed")
+
+    with HybridScheduler(failing, failing, config) as scheduler:
+        before = dict(scheduler.cost_model.latency_per_unit)
+        with pytest.raises(RuntimeError):
+            scheduler.submit(0.5).result(timeout=5)
+    assert scheduler.cost_model.latency_per_unit == before
+
+def test_thresholds_follow_settings_reload(tmp_path, monkeypatch):
+    import src.config.settings as settings_module
+    path = tmp_path / "config.yaml"
+    template = ("environment: {{num_qubits: 2, noise_level: 0.01, max_steps: 10, reward_threshold: 0.9}}\n"
+                "hybrid_control: {{thresholds: {{complexity: {}, noise: 0.1}}, quantum_volume_min: 1}}\n")
+    path.write_text(template.format(0.7))
+    monkeypatch.setattr(settings_module, "_settings", settings_module.Settings(path))
+    scheduler = HybridScheduler(tag(QUANTUM), tag(CLASSICAL))
+    assert not scheduler.quantum_eligible(0.5)
+    path.write_text(template.format(0.2) + "\n")
+    assert settings_module.get_settings().reload()
+    scheduler.choose_resource(0.5)
+    assert scheduler.config.complexity_threshold == 0.2
+    assert scheduler.quantum_eligible(0.5)
+
+def test_tasks_submitted_during_shutdown_resolve(config):
+    for _ in range(20):
+        scheduler = HybridScheduler(tag(QUANTUM), tag(CLASSICAL), config)
+        scheduler.start()
+        futures = []
+
+        def produce():
+            try:
+                while True:
+                    futures.append(scheduler.submit(0.1))
+            except SchedulerClosedError:
+                pass
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        scheduler.shutdown()
+        producer.join()
+        assert all(future.done() for future in futures)
@@ -0,0 +1,77 @@
+import io
+import os
+import pytest
+from src.security.quantum_security import QuantumSecurity, SecurityException, STREAM_HEADER, FRAME_HEADER
+
+CHUNK_SIZE = 4096
+
+@pytest.fixture
+def security(tmp_path):
+    return QuantumSecurity(key_file=str(tmp_path / "key"))
+
+def encrypt(security, data):
+    out = io.BytesIO()
+    manifest = security.encrypt_stream(memoryview(data), out, chunk_size=CHUNK_SIZE, max_workers=2)
+    return out.getvalue(), manifest
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK_SIZE, 3 * CHUNK_SIZE + 7])
+def test_stream_round_trip(security, size):
+    data = os.urandom(size)
+    encrypted, manifest = encrypt(security, data)
+    out = io.BytesIO()
+    assert security.decrypt_stream(io.BytesIO(encrypted), out, digests=manifest.digests) == size
+    assert out.getvalue() == data
+    assert manifest.total_bytes == size
+    assert manifest.digests[0] == security.hash_chunk(data[:CHUNK_SIZE])
+
+def test_random_access_chunk(security):
+    data = os.urandom(5 * CHUNK_SIZE)
+    encrypted, _ = encrypt(security, data)
+    assert security.decrypt_chunk(encrypted, 3) == data[3 * CHUNK_SIZE:4 * CHUNK_SIZE]
+    with pytest.raises(IndexError):
+        security.decrypt_chunk(encrypted, 5)
+
+def test_tampered_chunk_is_rejected(security):
+    encrypted, _ = encrypt(security, os.urandom(2 * CHUNK_SIZE))
+    tampered = bytearray(encrypted)
+    tampered[STREAM_HEADER.size + 10] ^= 0xFF
+    with pytest.raises(SecurityException):
+        security.decrypt_stream(bytes(tampered), io.BytesIO())
+
+def test_truncated_stream_is_rejected(security):
+    encrypted, _ = encrypt(security, os.urandom(3 * CHUNK_SIZE))
+    frame_size = (len(encrypted) - STREAM_HEADER.size) // 3
+    with pytest.raises(SecurityException):
+        security.decrypt_stream(encrypted[:STREAM_HEADER.size + 2 * frame_size], io.BytesIO())
+
+def test_random_access_chunk_checks_digest(security):
+    data = os.urandom(3 * CHUNK_SIZE)
+    encrypted, manifest = encrypt(security, data)
+    assert security.decrypt_chunk(bytearray(encrypted), 1, digest=manifest.digests[1]) == data[CHUNK_SIZE:2 * CHUNK_SIZE]
+    with pytest.raises(SecurityException):
+        security.decrypt_chunk(encrypted, 1, digest=manifest.digests[0])
+
+def test_streams_survive_key_rotation(security):
+    data = os.urandom(2 * CHUNK_SIZE)
+    encrypted, _ = encrypt(security, data)
+    security.rotate_key()
+    security.rotate_key()
+    out = io.BytesIO()
+    security.decrypt_stream(encrypted, out)
+    assert out.getvalue() == data
+
+def test_missing_stream_key_is_reported(tmp_path):
+    data = os.urandom(CHUNK_SIZE)
+    encrypted, _ = encrypt(QuantumSecurity(key_file=str(tmp_path / "a")), data)
+    with pytest.raises(SecurityException, match="not available"):
+        QuantumSecurity(key_file=str(tmp_path / "b")).decrypt_chunk(encrypted, 0)
+
+@pytest.mark.parametrize("length", [0, 2 ** 32 - 1])
+def test_oversized_frame_length_is_rejected(security, length):
+    encrypted, _ = encrypt(security, os.urandom(2 * CHUNK_SIZE))
+    tampered = bytearray(encrypted)
+    FRAME_HEADER.pack_into(tampered, STREAM_HEADER.size, length, 0)
+    with pytest.raises(SecurityException, match="frame length"):
+        security.decrypt_stream(tampered, io.BytesIO())
+    with pytest.raises(SecurityException, match="frame length"):
+        security.decrypt_chunk(io.BytesIO(tampered), 0)
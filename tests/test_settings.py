@@ -0,0 +1,82 @@
+import pytest
+import src.config.settings as settings_module
+from src.config.settings import ConfigurationError, Settings, get_settings
+
+CONFIG_TEMPLATE = """
+environment:
+  num_qubits: {num_qubits}
+  noise_level: {noise_level}
+  max_steps: 100
+  reward_threshold: 0.95
+"""
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG_TEMPLATE.format(num_qubits=2, noise_level=0.01))
+    return path
+
+def test_get_settings_is_singleton():
+    assert get_settings() is get_settings()
+
+def test_sub_configs_are_frozen(config_file):
+    settings = Settings(config_file)
+    with pytest.raises(TypeError):
+        settings.environment.noise_level = 0.5
+
+def test_environment_variable_override(config_file, monkeypatch):
+    monkeypatch.setenv("QUANTUM_ENVIRONMENT_NUM_QUBITS", "4")
+    settings = Settings(config_file)
+    assert settings.environment.num_qubits == 4
+
+def test_reload_on_file_change(config_file, monkeypatch):
+    monkeypatch.delenv("QUANTUM_ENVIRONMENT_NUM_QUBITS", raising=False)
+    settings = Settings(config_file)
+    assert not settings.check_for_changes()
+    config_file.write_text(CONFIG_TEMPLATE.format(num_qubits=2, noise_level=0.05) + "\n")
+    assert settings.check_for_changes()
+    assert settings.environment.noise_level == 0.05
+
+def test_invalid_reload_keeps_previous_snapshot(config_file, monkeypatch):
+    monkeypatch.delenv("QUANTUM_ENVIRONMENT_NUM_QUBITS", raising=False)
+    settings = Settings(config_file)
+    previous = settings.snapshot
+    config_file.write_text(CONFIG_TEMPLATE.format(num_qubits=99, noise_level=0.01) + "\n")
+    assert not settings.reload()
+    assert settings.snapshot is previous
+
+def test_config_path_from_environment(config_file, monkeypatch):
+    monkeypatch.setenv("QUANTUM_CONFIG_PATH", str(config_file))
+    monkeypatch.setenv("QUANTUM_ENVIRONMENT_NUM_QUBITS", "3")
+    settings = Settings()
+    assert settings.config_path == config_file
+    assert settings.environment.num_qubits == 3
+    assert 'config' not in settings.settings
+
+def test_get_settings_uses_given_path(config_file, monkeypatch):
+    monkeypatch.setattr(settings_module, "_settings", None)
+    assert get_settings(config_file).config_path == config_file
+    assert get_settings() is get_settings(config_file)
+    with pytest.raises(ValueError):
+        get_settings(config_file.with_name("other.yaml"))
+
+def test_raw_settings_are_read_only(config_file):
+    settings = Settings(config_file)
+    with pytest.raises(TypeError):
+        settings.settings['environment']['num_qubits'] = 8
+
+def test_default_path_is_repository_config():
+    assert settings_module.DEFAULT_SETTINGS_PATH.exists()
+
+def test_missing_environment_section_names_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("training:\n  batch_size: 32\n")
+    with pytest.raises(ConfigurationError, match="config.yaml"):
+        Settings(path)
+
+def test_unrelated_environment_variables_ignored(config_file, monkeypatch):
+    monkeypatch.setenv("QUANTUM_BENCHMARK_BASELINE", "/tmp/baseline.json")
+    monkeypatch.setenv("QUANTUM_TRAINING_BATCH_SIZE", "16")
+    settings = Settings(config_file)
+    assert 'benchmark' not in settings.settings
+    assert settings.training.batch_size == 16
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import time
+import urllib.request
+import numpy as np
+import pytest
+from src.service import SimulationService, SimulationClient, ServiceConfig, ServiceError, EnvironmentBackend
+
+class FakeEnvironment:
+    def __init__(self, num_qubits=2):
+        self.num_qubits = num_qubits
+
+    def reset(self):
+        self.steps = 0
+        return np.eye(2 ** self.num_qubits)[0]
+
+    def step(self, action):
+        self.steps += 1
+        return np.eye(2 ** self.num_qubits)[action], 1.0, self.steps >= 3, {'steps': self.steps}
+
+def fake_executor(circuits):
+    return [{'0': len(qasm)} for qasm in circuits]
+
+def run_service(scenario, **config):
+    async def main():
+        service = SimulationService(ServiceConfig(port=0, **config),
+                                    EnvironmentBackend(FakeEnvironment, fake_executor))
+        await service.start()
+        try:
+            return await scenario(service)
+        finally:
+            await service.stop()
+    return asyncio.run(main())
+
+def test_reset_step_execute_round_trip():
+    async def scenario(service):
+        client = await SimulationClient.connect(port=service.config.port)
+        try:
+            reset = await client.reset('a', num_qubits=1)
+            step = await client.step('a', 1)
+            executed = await client.execute('qasm')
+        finally:
+            await client.close()
+        return reset, step, executed
+
+    reset, step, executed = run_service(scenario)
+    assert reset['state'] == [1.0, 0.0]
+    assert step['state'] == [0.0, 1.0]
+    assert step['info'] == {'steps': 1}
+    assert executed == {'result': {'0': 4}}
+
+def test_step_without_reset_is_an_error():
+    async def scenario(service):
+        client = await SimulationClient.connect(port=service.config.port)
+        try:
+            with pytest.raises(ServiceError):
+                await client.step('missing', 0)
+        finally:
+            await client.close()
+
+    run_service(scenario)
+
+def test_concurrent_requests_are_batched():
+    async def scenario(service):
+        clients = [await SimulationClient.connect(port=service.config.port) for _ in range(16)]
+        try:
+            await asyncio.gather(*(client.reset(f"s{i}") for i, client in enumerate(clients)))
+            return await clients[0].request('metrics')
+        finally:
+            for client in clients:
+                await client.close()
+
+    metrics = run_service(scenario, max_batch_latency=0.05, workers=1)
+    assert metrics['requests'] == 16
+    assert metrics['batch_size']['count'] < 16
+
+def test_sessions_closed_with_connection():
+    async def scenario(service):
+        client = await SimulationClient.connect(port=service.config.port)
+        await client.reset('a')
+        await client.reset('b')
+        assert sorted(session for _, session in service.backend.sessions) == ['a', 'b']
+        await client.close()
+        for _ in range(100):
+            if not service.backend.sessions:
+                break
+            await asyncio.sleep(0.01)
+        return dict(service.backend.sessions)
+
+    assert run_service(scenario) == {}
+
+def test_non_object_request_gets_error_reply():
+    async def scenario(service):
+        reader, writer = await asyncio.open_connection(port=service.config.port)
+        try:
+            writer.write(b'[1]\n')
+            await writer.drain()
+            return json.loads(await asyncio.wait_for(reader.readline(), 5))
+        finally:
+            writer.close()
+
+    response = run_service(scenario)
+    assert response['ok'] is False
+    assert 'JSON object' in response['error']
+
+def test_sessions_are_private_to_their_connection():
+    async def scenario(service):
+        owner = await SimulationClient.connect(port=service.config.port)
+        other = await SimulationClient.connect(port=service.config.port)
+        try:
+            await owner.reset('shared')
+            with pytest.raises(ServiceError):
+                await other.step('shared', 0)
+            assert await other.request('close', session='shared') == {'closed': False}
+            return await owner.step('shared', 1)
+        finally:
+            await owner.close()
+            await other.close()
+
+    assert run_service(scenario)['info'] == {'steps': 1}
+
+class SlowEnvironment(FakeEnvironment):
+    def step(self, action):
+        time.sleep(0.2)
+        return super().step(action)
+
+def test_sessions_in_a_batch_step_concurrently():
+    async def scenario(service):
+        clients = [await SimulationClient.connect(port=service.config.port) for _ in range(4)]
+        try:
+            await asyncio.gather(*(client.reset('s') for client in clients))
+            start = time.perf_counter()
+            await asyncio.gather(*(client.step('s', 0) for client in clients))
+            return time.perf_counter() - start
+        finally:
+            for client in clients:
+                await client.close()
+
+    async def main():
+        service = SimulationService(ServiceConfig(port=0, workers=1, max_batch_latency=0.05),
+                                    EnvironmentBackend(SlowEnvironment, fake_executor, session_workers=4))
+        await service.start()
+        try:
+            return await scenario(service)
+        finally:
+            await service.stop()
+
+    assert asyncio.run(main()) < 0.6
+
+def test_prometheus_metrics_are_served():
+    pytest.importorskip("prometheus_client")
+
+    async def scenario(service):
+        client = await SimulationClient.connect(port=service.config.port)
+        try:
+            await client.execute('qasm')
+        finally:
+            await client.close()
+        url = f"http://127.0.0.1:{service.config.prometheus_port}/metrics"
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: urllib.request.urlopen(url, timeout=5).read().decode())
+
+    body = run_service(scenario, export_prometheus=True, prometheus_port=0)
+    assert 'simulation_batch_size' in body
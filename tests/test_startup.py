@@ -0,0 +1,52 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must never be imported as a side effect of a cold import.
+HEAVY_MODULES = ('qiskit', 'tensorflow', 'prometheus_client', 'psutil', 'torch')
+
+# Cold-import budgets in milliseconds, measured with ``python -X importtime``.
+# They include numpy, which every entry point needs, with headroom for slow CI.
+IMPORT_BUDGETS_MS = {
+    'src.adaptive_error_correction': 200,
+    'src.adaptive_error_correction.environment': 1000,
+    'src.adaptive_error_correction.circuit_optimizer': 300,
+    'src.error_correction.agent': 300,
+    'src.monitoring.metrics': 300,
+    'adaptive_error_correction': 1000,
+    'materials_discovery': 1000,
+}
+
+def import_profile(module):
+    """Cold-import ``module`` in a subprocess and return cumulative times in us."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_no_heavy_backends_on_import(module):
+    profile = import_profile(module)
+    loaded = sorted(name for name in profile
+                    if name.split('.')[0] in HEAVY_MODULES)
+    assert not loaded, f"importing {module} eagerly loaded {loaded}"
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_cold_import_time(module):
+    profile = import_profile(module)
+    elapsed_ms = profile[module] / 1000
+    assert elapsed_ms <= IMPORT_BUDGETS_MS[module], (
+        f"cold import of {module} took {elapsed_ms:.1f} ms "
+        f"(budget {IMPORT_BUDGETS_MS[module]} ms)"
+    )
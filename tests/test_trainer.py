@@ -0,0 +1,61 @@
+import importlib
+import os
+import time
+import numpy as np
+import pytest
+from src.error_correction.trainer import AsyncCheckpointer, PolicyTrainer, TrainerConfig
+
+def import_tensorflow():
+    """Skip without TensorFlow, unless CI sets REQUIRE_TENSORFLOW to insist on it."""
+    if os.environ.get('REQUIRE_TENSORFLOW'):
+        return importlib.import_module('tensorflow')
+    return pytest.importorskip('tensorflow')
+
+def test_checkpointer_round_trip_and_retention(tmp_path):
+    checkpointer = AsyncCheckpointer(str(tmp_path), max_to_keep=2)
+    weights = [np.arange(6, dtype=np.float32).reshape(2, 3), np.ones(3)]
+    for step in (10, 20, 30):
+        checkpointer.save(step, weights)
+        checkpointer.wait()
+    checkpointer.close()
+    assert [p.name for p in checkpointer.checkpoints()] == ['ckpt-0000000020.npz', 'ckpt-0000000030.npz']
+    step, loaded = AsyncCheckpointer.load(checkpointer.latest())
+    assert step == 30
+    assert all(np.array_equal(a, b) for a, b in zip(loaded, weights))
+
+def test_checkpointer_skips_while_write_in_flight(tmp_path, monkeypatch):
+    checkpointer = AsyncCheckpointer(str(tmp_path))
+    original = checkpointer._write
+    monkeypatch.setattr(checkpointer, '_write', lambda *args: (time.sleep(0.2), original(*args))[1])
+    assert checkpointer.save(1, [np.zeros(2)]) is not None
+    assert checkpointer.save(2, [np.zeros(2)]) is None
+    checkpointer.close()
+    assert checkpointer.skipped == 1
+    assert checkpointer.saved == 1
+
+def test_gradient_accumulation_counts_updates(tmp_path):
+    tf = import_tensorflow()
+    model = tf.keras.Sequential([tf.keras.layers.Dense(2, input_shape=(3,))])
+    model.compile(optimizer='adam', loss='mse')
+    config = TrainerConfig(batch_size=10, accumulation_steps=3, checkpoint_dir=str(tmp_path),
+                           checkpoint_every=2, seed=0)
+    trainer = PolicyTrainer(model, config=config)
+    rng = np.random.default_rng(0)
+    result = trainer.fit(rng.random((70, 3)), rng.random((70, 2)))
+    # 7 micro-batches -> two full groups of 3; the partial group waits for close().
+    assert result['updates'] == 2
+    trainer.close()
+    assert trainer.updates == 3
+    assert trainer.checkpointer.latest() is not None
+
+def test_accumulation_spans_small_fit_calls():
+    tf = import_tensorflow()
+    model = tf.keras.Sequential([tf.keras.layers.Dense(2, input_shape=(3,))])
+    model.compile(optimizer='adam', loss='mse')
+    trainer = PolicyTrainer(model, config=TrainerConfig(batch_size=10, accumulation_steps=4))
+    rng = np.random.default_rng(0)
+    for _ in range(6):
+        trainer.fit(rng.random((8, 3)), rng.random((8, 2)))
+    assert trainer.updates == 1
+    trainer.flush()
+    assert trainer.updates == 2
@@ -1,10 +1,283 @@
 #!/usr/bin/env python
 # Data ingestion utility
+#
+# Experiment and calibration datasets are read in fixed-size chunks so that
+# training on recorded noise data never needs the whole file in RAM:
+#   - .npy files are memory-mapped and sliced without copying
+#   - .csv / .parquet files are streamed and converted to columnar NumPy
+#     arrays, which can be cached once as raw binary columns and then
+#     memory-mapped on later runs
+#   - prefetch() reads the next chunk on a background thread, copying
+#     memory-mapped chunks so their pages are actually read ahead
+
+import hashlib
+import json
+import os
+import queue
+import shutil
+import threading
+from pathlib import Path
 
 import numpy as np
 
+DEFAULT_CHUNK_SIZE = 65536
+CACHE_FORMAT_VERSION = 1
+
+
+class IngestionError(Exception):
+    """Raised when a dataset cannot be read or cached."""
+    pass
+
+
 def load_sample_data():
     return np.random.rand(100)
 
+
+def open_memmap(path):
+    """Memory-map a .npy file read-only; slices are zero-copy views."""
+    return np.load(path, mmap_mode='r')
+
+
+def iter_npy_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield consecutive row slices of a memory-mapped .npy array."""
+    data = open_memmap(path)
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def iter_csv_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Yield {column: ndarray} chunks from a CSV file.
+
+    pandas infers dtypes per chunk: an int64 column can turn float64 in a
+    later chunk that holds blanks or decimals.
+    """
+    import pandas as pd
+    reader = pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+    for frame in reader:
+        yield {name: frame[name].to_numpy() for name in frame.columns}
+
+
+def iter_parquet_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Yield {column: ndarray} chunks from a Parquet file (requires pyarrow)."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise IngestionError("Reading Parquet files requires pyarrow") from e
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        yield {name: column.to_numpy(zero_copy_only=False)
+               for name, column in zip(batch.schema.names, batch.columns)}
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Yield fixed-size chunks of a dataset, dispatching on file extension.
+
+    .npy files yield ndarray row slices; tabular formats yield dicts of
+    column arrays.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == '.npy':
+        return iter_npy_chunks(path, chunk_size)
+    if suffix == '.csv':
+        return iter_csv_chunks(path, chunk_size, columns)
+    if suffix in ('.parquet', '.pq'):
+        return iter_parquet_chunks(path, chunk_size, columns)
+    raise IngestionError(f"Unsupported dataset format: {path}")
+
+
+def _cache_key(path, columns):
+    stat = os.stat(path)
+    source = f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}:{columns}"
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def _promote_column(path, dtype, promoted, chunk_size):
+    """Rewrite a raw column file in place with a wider dtype, chunk by chunk."""
+    count = os.path.getsize(path) // dtype.itemsize
+    staging = path.with_name(f"{path.name}.promote")
+    with open(staging, 'wb') as out:
+        if count:
+            data = np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+            for start in range(0, count, chunk_size):
+                out.write(np.ascontiguousarray(data[start:start + chunk_size], dtype=promoted).tobytes())
+            del data
+    os.replace(staging, path)
+
+
+def build_columnar_cache(path, cache_dir, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Convert a CSV/Parquet dataset into raw binary column files.
+
+    Each column is appended chunk by chunk to ``<column>.bin`` and described
+    in ``meta.json``, so conversion runs in bounded memory. A column keeps
+    its first chunk's dtype (so int64 IDs stay exact) until a later chunk
+    needs a wider one, e.g. float64 for blanks; the rows written so far are
+    then rewritten in the promoted dtype. The cache is keyed on the source
+    path, mtime, size and column selection.
+    """
+    target = Path(cache_dir) / f"{Path(path).stem}-{_cache_key(path, columns)}"
+    if (target / 'meta.json').exists():
+        return target
+
+    staging = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    staging.mkdir(parents=True, exist_ok=True)
+    files, dtypes, rows = {}, {}, 0
+    try:
+        for chunk in iter_chunks(path, chunk_size, columns):
+            for name, values in chunk.items():
+                if values.dtype.kind not in 'biufc':
+                    raise IngestionError(
+                        f"Column '{name}' has non-numeric dtype {values.dtype}; exclude it via columns=")
+                if name not in files:
+                    dtypes[name] = values.dtype
+                    files[name] = open(staging / f"{name}.bin", 'wb')
+                elif not np.can_cast(values.dtype, dtypes[name], 'safe'):
+                    promoted = np.result_type(dtypes[name], values.dtype)
+                    files[name].close()
+                    _promote_column(staging / f"{name}.bin", dtypes[name], promoted, chunk_size)
+                    dtypes[name] = promoted
+                    files[name] = open(staging / f"{name}.bin", 'ab')
+                files[name].write(np.ascontiguousarray(values, dtype=dtypes[name]).tobytes())
+            rows += len(next(iter(chunk.values()), ()))
+    except BaseException:
+        for f in files.values():
+            f.close()
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    for f in files.values():
+        f.close()
+
+    meta = {
+        'version': CACHE_FORMAT_VERSION,
+        'source': os.path.abspath(path),
+        'rows': rows,
+        'columns': {name: dtype.str for name, dtype in dtypes.items()},
+    }
+    with open(staging / 'meta.json', 'w') as f:
+        json.dump(meta, f)
+    try:
+        os.replace(staging, target)
+    except OSError:
+        # Another process finished the same conversion first.
+        shutil.rmtree(staging, ignore_errors=True)
+        if not (target / 'meta.json').exists():
+            raise
+    return target
+
+
+def load_columnar_cache(cache_path):
+    """Memory-map every column of a cache built by build_columnar_cache."""
+    cache_path = Path(cache_path)
+    with open(cache_path / 'meta.json') as f:
+        meta = json.load(f)
+    if meta.get('version') != CACHE_FORMAT_VERSION:
+        raise IngestionError(f"Unsupported cache version in {cache_path}")
+    columns = {}
+    for name, dtype in meta['columns'].items():
+        if meta['rows'] == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(cache_path / f"{name}.bin", dtype=dtype,
+                                      mode='r', shape=(meta['rows'],))
+    return columns
+
+
+def load_columns(path, cache_dir=None, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Return {column: array} for a tabular dataset.
+
+    With ``cache_dir`` the dataset is converted once and the columns are
+    memory-mapped from the binary cache on every subsequent call.
+    """
+    if cache_dir is None:
+        parts = list(iter_chunks(path, chunk_size, columns))
+        if not parts:
+            return {}
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    return load_columnar_cache(build_columnar_cache(path, cache_dir, chunk_size, columns))
+
+
+def iter_cached_chunks(path, cache_dir, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Yield {column: ndarray} zero-copy chunks from the columnar cache."""
+    data = load_columns(path, cache_dir, chunk_size, columns)
+    rows = len(next(iter(data.values()), ()))
+    for start in range(0, rows, chunk_size):
+        yield {name: values[start:start + chunk_size] for name, values in data.items()}
+
+
+_END = object()
+
+
+def _materialize(chunk):
+    """Copy memory-mapped arrays into RAM so the disk reads happen now."""
+    if isinstance(chunk, dict):
+        return {name: _materialize(values) for name, values in chunk.items()}
+    if isinstance(chunk, np.memmap):
+        return np.array(chunk)
+    return chunk
+
+
+def prefetch(chunks, depth=1):
+    """Iterate ``chunks`` while a background thread reads up to ``depth`` ahead.
+
+    Slicing a memmap does no I/O, so memory-mapped chunks (.npy files and
+    the columnar cache) are copied into RAM by the producer; the consumer
+    then gets in-memory arrays rather than views. Exceptions raised by the
+    producer are re-raised in the consumer. Closing the returned generator
+    early stops the producer thread.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for chunk in chunks:
+                chunk = _materialize(chunk)
+                while not stop.is_set():
+                    try:
+                        buffer.put(chunk, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            item = _END
+        except BaseException as e:
+            item = e
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    worker = threading.Thread(target=produce, name="ingestion-prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        worker.join()
+
+
+def stream_dataset(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None, cache_dir=None, prefetch_depth=1):
+    """Stream a dataset in chunks with background prefetching.
+
+    Uses the memory-mapped columnar cache for tabular data when
+    ``cache_dir`` is given; .npy files are always memory-mapped.
+    """
+    if cache_dir is not None and Path(path).suffix.lower() != '.npy':
+        chunks = iter_cached_chunks(path, cache_dir, chunk_size, columns)
+    else:
+        chunks = iter_chunks(path, chunk_size, columns)
+    if prefetch_depth <= 0:
+        return chunks
+    return prefetch(chunks, prefetch_depth)
+
+
 if __name__ == "__main__":
     print("Data ingestion module initialized.")